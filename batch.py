@@ -0,0 +1,101 @@
+import sys
+import os
+import io
+import csv
+import random
+import contextlib
+from multiprocessing import Pool
+
+## Importa as classes que serao usadas
+sys.path.append(os.path.join("pkg"))
+from main import loadConfig, loadModelAndMaze
+from agentExplorer import AgentExplorer
+from agentRescue import AgentRescue
+from pathCache import PathCache
+
+## Colunas do CSV gerado (uma linha por cenário/semente)
+columns = ["ambiente", "sinais_vitais", "seed", "victims",
+           "found", "explorer_cost", "pve", "tve", "veg",
+           "saved", "rescue_cost", "pvs", "tvs", "vsg"]
+
+
+def runScenario(job):
+    """Executa o agente explorador seguido do agente de resgate para um cenário, sem interface gráfica.
+    @param job: tupla (arquivo do ambiente, arquivo dos sinais vitais, semente, pasta do cache de caminhos ou None,
+    usar os campos de distância do NumPy)
+    @return dicionário com as estatísticas do explorador e as métricas do resgate"""
+    ambiente, sinaisVitais, seed, cacheDir, distanceFields = job
+    random.seed(seed)
+
+    ## Os agentes imprimem bastante coisa; nos workers a saída é descartada
+    with contextlib.redirect_stdout(io.StringIO()):
+        configDict = loadConfig(ambiente)
+        model = loadModelAndMaze(configDict, True, os.path.abspath(ambiente), sinaisVitais)
+
+        agentExplorer = AgentExplorer(model, configDict["Te"], False)
+        while agentExplorer.deliberate() != -1:
+            pass
+
+        pathCache = None
+        if cacheDir:
+            pathCache = PathCache(cacheDir)
+        agentRescue = AgentRescue(model, agentExplorer.prob, configDict["Ts"], False, pathCache, distanceFields=distanceFields)
+        while agentRescue.deliberate() != -1:
+            pass
+
+        statistics = agentExplorer.getStatistics()
+        metrics = agentRescue.getMetrics()
+
+    return {"ambiente": ambiente,
+            "sinais_vitais": sinaisVitais,
+            "seed": seed,
+            "victims": model.getNumberOfVictims(),
+            "found": statistics["found"],
+            "explorer_cost": statistics["cost"],
+            "pve": statistics["pve"],
+            "tve": statistics["tve"],
+            "veg": statistics["veg"],
+            "saved": metrics["saved"],
+            "rescue_cost": metrics["cost"],
+            "pvs": metrics["pvs"],
+            "tvs": metrics["tvs"],
+            "vsg": metrics["vsg"]}
+
+
+def get_args():
+    import argparse
+    parser = argparse.ArgumentParser(description="Rescue Simulator - execução em lote")
+    parser.add_argument("-s", "--scenario", nargs=2, action="append", metavar=("AMBIENTE", "SINAIS_VITAIS"),
+                        help="Par de arquivos ambiente.txt/sinais_vitais.txt (pode ser repetido)")
+    parser.add_argument("--seeds", nargs=2, type=int, default=[0, 1], metavar=("INICIO", "FIM"),
+                        help="Intervalo de sementes [INICIO, FIM) executado para cada cenário")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Número de processos")
+    parser.add_argument("-o", "--output", default="resultados.csv", help="Arquivo CSV de saída")
+    parser.add_argument("--path-cache", default=None, help="Pasta do cache em disco da tabela de caminhos entre as vítimas")
+    parser.add_argument("--distance-fields", action="store_true", default=False,
+                        help="Calcula a tabela de caminhos entre as vítimas com campos de distância do NumPy")
+    args = parser.parse_args()
+    if not args.scenario:
+        args.scenario = [[os.path.join("config_data", "ambiente.txt"), os.path.join("config_data", "sinais_vitais.txt")]]
+    return args
+
+
+def main():
+    args = get_args()
+
+    jobs = []
+    for ambiente, sinaisVitais in args.scenario:
+        for seed in range(args.seeds[0], args.seeds[1]):
+            jobs.append((ambiente, sinaisVitais, seed, args.path_cache, args.distance_fields))
+
+    with Pool(args.workers) as pool, open(args.output, "w", newline="") as arq:
+        writer = csv.DictWriter(arq, fieldnames=columns)
+        writer.writeheader()
+        for row in pool.imap(runScenario, jobs):
+            writer.writerow(row)
+            print(row["ambiente"], "seed", row["seed"], "pve:", row["pve"], "pvs:", row["pvs"], "vsg:", row["vsg"])
+
+    print("Resultados salvos em", args.output)
+
+if __name__ == '__main__':
+    main()
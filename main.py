@@ -1,12 +1,18 @@
 import sys
 import os
 import time
+import importlib.util
 
 ## Importa as classes que serao usadas
 sys.path.append(os.path.join("pkg"))
 from model import Model
 from agentExplorer import AgentExplorer
+from explorerTeam import ExplorerTeam
+from rescueTeam import RescueTeam
 from agentRescue import AgentRescue
+from pathCache import PathCache
+from profiler import Profiler
+from traceLog import TraceLog
 
 ## Metodo utilizado para permitir que o usuario construa o labirindo clicando em cima
 def buildMaze(model):
@@ -20,8 +26,8 @@ def buildMaze(model):
 
 
 # Faz a leitura dos parâmetros do ambiente
-def loadConfig():
-    arq = open(os.path.join("config_data","ambiente.txt"),"r")
+def loadConfig(path = os.path.join("config_data","ambiente.txt")):
+    arq = open(path,"r")
     configDict = {}
     for line in arq:
             var, *values = line.replace('\n', '').split(' ')
@@ -39,14 +45,14 @@ def loadConfig():
     
     return configDict
 
-def loadModelAndMaze(configDict):
+def loadModelAndMaze(configDict, headless = False, loadMaze = "ambiente", vitalSignalsFile = False):
     # Cria o ambiente (modelo) = Labirinto com suas paredes
     mesh = "square"
 
-    ## nome do arquivo de configuracao do ambiente - deve estar na pasta <proj>/config_data
-    loadMaze = "ambiente"
+    ## loadMaze: nome do arquivo de configuracao do ambiente na pasta <proj>/config_data
+    ## (ou o caminho completo de um arquivo .txt)
 
-    model = Model(configDict["XMax"], configDict["YMax"], mesh, loadMaze)
+    model = Model(configDict["XMax"], configDict["YMax"], mesh, loadMaze, headless, vitalSignalsFile)
     buildMaze(model)
 
     # Define a posição inicial do agente no ambiente - corresponde ao estado inicial
@@ -55,11 +61,44 @@ def loadModelAndMaze(configDict):
 
     return model
 
+def positiveInt(value):
+    """ Tipo do argparse para inteiros maiores ou iguais a 1 """
+    import argparse
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("deve ser maior ou igual a 1: " + value)
+    return number
+
 def get_args():
     import argparse
     parser = argparse.ArgumentParser(description="Rescue Simulator")
     parser.add_argument("-d", "--debug", help="Debug mode", action="store_false", default=True)
+    parser.add_argument("--headless", help="Executa sem interface grafica e sem pausas entre os ciclos", action="store_true", default=False)
+    parser.add_argument("--path-cache", help="Pasta do cache em disco da tabela de caminhos entre as vitimas", default=None)
+    parser.add_argument("--distance-fields", help="Calcula a tabela de caminhos entre as vitimas com campos de distancia do NumPy (mais rapido em mapas grandes)", action="store_true", default=False)
+    parser.add_argument("--islands", help="Numero de ilhas (processos) do algoritmo genetico do agente de resgate", type=int, default=1)
+    parser.add_argument("--anytime", help="O agente de resgate comeca a andar com o plano guloso enquanto o algoritmo genetico roda em segundo plano", action="store_true", default=False)
+    parser.add_argument("--explorer", help="Plano de exploracao do agente explorador (padrao: dfs com um explorador, frontier com --explorers maior que 1)",
+                        choices=["dfs", "frontier"], default=None)
+    parser.add_argument("--explorers", help="Numero de agentes exploradores, com as crencas compartilhadas", type=int, default=1)
+    parser.add_argument("--rescuers", help="Numero de agentes de resgate, com as vitimas divididas entre eles", type=int, default=1)
+    parser.add_argument("--planner", help="Plano do agente de resgate", choices=["genetic", "greedy", "heap", "orienteering"], default="genetic")
+    parser.add_argument("--lookahead", help="Numero de vitimas olhadas a frente pelo plano guloso com heap (--planner heap)", type=int, default=3)
+    parser.add_argument("--trace", help="Arquivo JSONL onde e registrado o raciocinio dos agentes, no lugar das mensagens do modo debug (ver readTrace.py)", default=None)
+    parser.add_argument("--trace-level", help="Nivel de detalhe do registro (--trace)", choices=["eventos", "ciclos"], default="ciclos")
+    parser.add_argument("--trace-sample", help="Registra um a cada N ciclos de cada agente (--trace)", type=positiveInt, default=1)
+    parser.add_argument("--profile", help="Arquivo JSON onde sao salvos os tempos de cada fase do ciclo dos agentes e da construcao dos planos", default=None)
     args = parser.parse_args()
+    if args.explorer is None:
+        # só o plano "frontier" coordena os destinos dos exploradores de um time (ver FrontierExplorationPlan)
+        args.explorer = "frontier" if args.explorers > 1 else "dfs"
+    if args.rescuers > 1:
+        # o time de resgate segue os tours de RescueAllocation; as opções do plano de um agente de resgate não se aplicam
+        ignored = ["--" + name for name in ("planner", "lookahead", "anytime", "islands") if getattr(args, name) != parser.get_default(name)]
+        if ignored:
+            parser.error("--rescuers maior que 1 divide as vitimas com RescueAllocation e nao aceita " + ", ".join(ignored))
+    if args.distance_fields and importlib.util.find_spec("numpy") is None:
+        parser.error("--distance-fields requer o NumPy")
     return args
 
 
@@ -71,23 +110,52 @@ def main():
     args = get_args()
 
     # Cria o ambiente (modelo)
-    model = loadModelAndMaze(configDict)
+    model = loadModelAndMaze(configDict, args.headless)
+
+    # Instrumentação dos agentes (opcional)
+    profiler = Profiler() if args.profile else None
 
-    # Cria um agente explorador
-    agentExplorer = AgentExplorer(model, configDict["Te"], args.debug)
+    # Registro do raciocínio dos agentes (opcional), no lugar das mensagens do modo debug
+    trace = None
+    debug = args.debug
+    if args.trace:
+        trace = TraceLog(args.trace, args.trace_level, args.trace_sample)
+        debug = False
+
+    # Cria um agente explorador (ou um time de exploradores que compartilham as crenças)
+    if args.explorers > 1:
+        agentExplorer = ExplorerTeam(model, configDict["Te"], debug, args.explorers, args.explorer, profiler, trace)
+    else:
+        agentExplorer = AgentExplorer(model, configDict["Te"], debug, args.explorer, profiler=profiler, trace=trace)
 
     while agentExplorer.deliberate() != -1:
         model.draw()
-        time.sleep(0.001) # para dar tempo de visualizar as movimentacoes do agente no labirinto
+        if not args.headless:
+            time.sleep(0.001) # para dar tempo de visualizar as movimentacoes do agente no labirinto
     model.draw()
 
-    # Cria um agente de resgate
-    agentRescue = AgentRescue(model, agentExplorer.prob, configDict["Ts"], args.debug)
+    # Cache da tabela de caminhos entre as vítimas (opcional)
+    pathCache = None
+    if args.path_cache:
+        pathCache = PathCache(args.path_cache)
+
+    # Cria um agente de resgate (ou um time de agentes de resgate que dividem as vítimas)
+    if args.rescuers > 1:
+        agentRescue = RescueTeam(model, agentExplorer.prob, configDict["Ts"], debug, args.rescuers, pathCache, profiler, trace, args.distance_fields)
+    else:
+        agentRescue = AgentRescue(model, agentExplorer.prob, configDict["Ts"], debug, pathCache, args.islands, args.anytime, args.planner, args.lookahead,
+                                  profiler=profiler, trace=trace, distanceFields=args.distance_fields)
 
     while agentRescue.deliberate() != -1:
         model.draw()
-        time.sleep(0.075) # para dar tempo de visualizar as movimentacoes do agente no labirinto
+        if not args.headless:
+            time.sleep(0.075) # para dar tempo de visualizar as movimentacoes do agente no labirinto
     model.draw()
 
+    if profiler is not None:
+        profiler.dump(args.profile)
+    if trace is not None:
+        trace.close()
+
 if __name__ == '__main__':
     main()
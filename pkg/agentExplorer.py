@@ -14,7 +14,11 @@ from random import randint
 
 ## Importa o algoritmo para o plano
 from baseReturnPlan import BaseReturnPlan
+from baseCostField import BaseCostField
 from onlineDFSPlan import OnlineDFSPlan
+from frontierExplorationPlan import FrontierExplorationPlan
+from nullProfiler import NullProfiler
+from nullTraceLog import NullTraceLog
 
 ##Importa o Planner
 sys.path.append(os.path.join("pkg", "planner"))
@@ -22,15 +26,25 @@ from planner import Planner
 
 ## Classe que define o Agente
 class AgentExplorer:
-    def __init__(self, model, time, debug_mode):
+    def __init__(self, model, time, debug_mode, explorer = "dfs", team = None, agentIndex = 0, profiler = None, trace = None):
         """ 
         Construtor do agente explorador
         @param model: referencia o ambiente onde o agente está situado
         @parm time: tempo para execução
+        @param explorer: plano de exploração: "dfs" (OnlineDFSPlan) ou "frontier" (FrontierExplorationPlan)
+        @param team: ExplorerTeam cujas crenças (problema e campo de custos até a base) são compartilhadas com os outros exploradores
+        @param agentIndex: índice do agente no modelo (ver Model.addAgent)
+        @param profiler: Profiler que mede o tempo de cada fase do ciclo de raciocínio (None: sem medição)
+        @param trace: TraceLog onde é registrado cada ciclo de raciocínio (None: sem registro)
         """
 
         self.debug = debug_mode
         self.model = model
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        self.trace = trace if trace is not None else NullTraceLog()
+        self.cycles = 0
+        self.agentIndex = agentIndex
+        self.model.activateAgent(agentIndex)
 
         ## Obtem o tempo que tem para executar
         self.time = time
@@ -40,12 +54,15 @@ class AgentExplorer:
         ## Pega o tipo de mesh, que está no model (influência na movimentação)
         self.mesh = self.model.mesh
 
-        ## Cria a instância do problema na mente do agente (sao suas crencas)
-        self.prob = Problem(model.rows, model.columns)
-    
         # O agente le sua posica no ambiente por meio do sensor
         initial = self.positionSensor()
-        self.prob.defBasePosition(initial.row, initial.col)
+
+        ## Cria a instância do problema na mente do agente (sao suas crencas), ou usa as crenças do time
+        if team is None:
+            self.prob = Problem(model.rows, model.columns)
+            self.prob.defBasePosition(initial.row, initial.col)
+        else:
+            self.prob = team.prob
         # Define o estado atual do agente = estado inicial
         self.currentState = self.prob.basePosition
         print("*** Estado inicial do agente: ", self.prob.basePosition)
@@ -54,8 +71,20 @@ class AgentExplorer:
         ## Custo da solução
         self.costAll = 0
 
+        ## Custo para voltar para a base a partir de cada posição, atualizado conforme o mapa é descoberto
+        if team is None:
+            self.baseCostField = BaseCostField(self.prob)
+            self.prob.addObserver(self.baseCostField)
+        else:
+            self.baseCostField = team.baseCostField
+
         ## Cria a instancia do plano para se movimentar aleatoriamente no labirinto (sem nenhuma acao) 
-        self.plan = OnlineDFSPlan(self.prob, initial, "explorar")
+        if explorer == "frontier":
+            claims = team.claims if team is not None else None
+            self.plan = FrontierExplorationPlan(self.prob, initial, "explorar", claims=claims, agentId=agentIndex)
+            self.prob.addObserver(self.plan)
+        else:
+            self.plan = OnlineDFSPlan(self.prob, initial, "explorar")
 
         ## Adiciona o(s) planos a biblioteca de planos do agente
         self.libPlan=[self.plan]
@@ -71,10 +100,18 @@ class AgentExplorer:
         if not (self.canKeepExecuting()): 
             return -1
 
+        # Os sensores e atuadores do modelo passam a ser os deste agente (ver Model.activateAgent)
+        self.model.activateAgent(self.agentIndex)
+
+        self.cycles += 1
+        self.profiler.count("explorador.ciclos")
+
         # Se o plano atual não é voltar para a base, verifica se é necessário começar executar o plano de voltar para a base
         if (self.plan.name != "voltarBase"):
-            self.updateCurrentState()
-            self.checkShouldReturnToBase()
+            with self.profiler.phase("explorador.updateCurrentState"):
+                self.updateCurrentState()
+            with self.profiler.phase("explorador.checkShouldReturnToBase"):
+                self.checkShouldReturnToBase()
 
         # Atualiza o plano que irá executar
         self.plan = self.libPlan[0]
@@ -85,10 +122,12 @@ class AgentExplorer:
             print("Pos agente no amb.: ", self.positionSensor())
 
         # Redefine o estado atual do agente de acordo com o resultado da execução da ação do ciclo anterior
-        self.updateCurrentState()
+        with self.profiler.phase("explorador.updateCurrentState"):
+            self.updateCurrentState()
 
         # Verifica se a execução da ação do ciclo anterior funcionou ou não
-        self.checkPreviousExecution()
+        with self.profiler.phase("explorador.checkPreviousExecution"):
+            self.checkPreviousExecution()
 
         # Funcionou ou nao, vou somar o custo da acao com o total 
         self.costAll += self.prob.getActionCost(self.previousAction)
@@ -99,13 +138,18 @@ class AgentExplorer:
         self.time -= self.prob.getActionCost(self.previousAction)
         if(self.debug):
             print("Tempo disponivel: ", self.time)
+        cost, remaining = self.costAll, self.time
         
         # Verifica se tem alguma vítima na posição atual do robô
-        self.checkForVictim()
+        with self.profiler.phase("explorador.checkForVictim"):
+            self.checkForVictim()
 
         # Define a proxima acao a ser executada e executa-a
         self.executeNextAction()
 
+        # Registra o ciclo (ver TraceLog)
+        self.trace.cycle("explorador", self.agentIndex, self.cycles, self.currentState, cost, remaining, self.previousAction, self.expectedState)
+
         return 1
 
     ## Metodo que executa as acoes
@@ -121,10 +165,18 @@ class AgentExplorer:
         # Se já terminei de executar a DFS, cria um plano para voltar para a base
         if (action == "nop" and self.plan.name == "explorar"):
             self.libPlan.pop(0)
-            self.libPlan.append(BaseReturnPlan(self.prob, self.currentState, "voltarBase"))
+            self.libPlan.append(self.createBaseReturnPlan())
 
         ## Passa a acao para o modelo
-        result = self.model.go(action)
+        with self.profiler.phase("explorador.model.go"):
+            result = self.model.go(action)
+
+    """Cria o plano de voltar para a base a partir da posição atual, medindo o tempo da busca e os nós expandidos"""
+    def createBaseReturnPlan(self):
+        with self.profiler.phase("BaseReturnPlan"):
+            plan = BaseReturnPlan(self.prob, self.currentState, "voltarBase")
+        self.profiler.count("BaseReturnPlan.expansoes", plan.pathFinder.expansions)
+        return plan
 
     ## Metodo que pega a posicao real do agente no ambiente
     def positionSensor(self):
@@ -160,9 +212,10 @@ class AgentExplorer:
         ## Verifica se tem vitima na posicao atual    
         victimId = self.victimPresenceSensor()
         if victimId > 0 and not self.prob.isVictimInPosition(self.currentState): #Se encontrei vítima e ela ainda não está no mapa: tenho que adicionar a posição da vítima no mapa
+            vitalSignals = self.getVictimVitalSignals(victimId)
             if(self.debug):
-                print ("vitima encontrada em ", self.currentState, " id: ", victimId, " sinais vitais: ", self.victimVitalSignalsSensor(victimId))
-            self.getVictimVitalSignals(victimId)
+                print ("vitima encontrada em ", self.currentState, " id: ", victimId, " sinais vitais: ", vitalSignals)
+            self.trace.victimFound("explorador", self.agentIndex, self.cycles, self.currentState, victimId, vitalSignals)
             self.addVictimToMap(self.currentState, victimId)
 
     """Checa os sinais vitais da vítima especificada e consome o tempo dessa ação.
@@ -215,6 +268,7 @@ class AgentExplorer:
         if not (self.currentState == self.expectedState): #Ação não funcionou: tenho que marcar uma parede no mapa
             if(self.debug):
                 print("---> erro na execucao da acao ", self.previousAction, ": esperava estar em ", self.expectedState, ", mas estou em ", self.currentState)
+            self.trace.actionError("explorador", self.agentIndex, self.cycles, self.previousAction, self.expectedState, self.currentState)
             self.addWallToMap(self.expectedState)
         else: #Ação funcionou: tenho que marcar o mapa como explorado
             if not(self.prob.isVictimInPosition(self.currentState)):
@@ -223,7 +277,8 @@ class AgentExplorer:
     """ Define a proxima acao a ser executada e então executa-a."""
     def executeNextAction(self):
         # Escolhe a próxima ação de acordo com o plano que está sendo executado
-        result = self.plan.chooseAction()
+        with self.profiler.phase("explorador.chooseAction"):
+            result = self.plan.chooseAction()
         # result é uma tupla na forma: <direcao>, <state>
         action = result[0]
         expectedState = result[1]
@@ -238,17 +293,16 @@ class AgentExplorer:
 
     """ Verifica se o agente deveria iniciar a execução do plano de voltar para a base.
     Se o agente ainda tem mais tempo sobrando do que ele usou até agora, quer dizer que tem tempo suficiente para continuar executando
-    Se tem menos tempo sobrando do que o tempo que usou até agora, cria um plano para voltar para a base e verifica quanto demoraria para voltar.
+    Se tem menos tempo sobrando do que o tempo que usou até agora, consulta no campo de custos quanto demoraria para voltar.
     Se executando uma ação, um salvamento, e uma ação para voltar para o local atual o agente ainda teria tempo sobrando para voltar para a base
-    ele joga o plano fora e continua a execução do plano atual. No entanto, se ele não teria tempo para executar uma nova ação e um salvamento
-    ele atualiza o plano atual e volta para a base.
+    ele continua a execução do plano atual. No entanto, se ele não teria tempo para executar uma nova ação e um salvamento
+    ele cria o plano de voltar para a base e passa a executá-lo.
     """
     def checkShouldReturnToBase(self):
         if(self.time-4 <= self.costAll): # Se não passar no if é porque tem mais tempo sobrando do que gastou até agora, então terá tempo para retornar
-            plano = BaseReturnPlan(self.prob, self.currentState, "voltarBase") # Cria plano de voltar para a base
-            if (self.time - plano.getCost() <= 4 ): # Verifica se tem tempo sobrando caso execute mais uma ação. Se não tiver, inicia o plano de voltar para a base
+            if (self.time - self.baseCostField.getCost(self.currentState) <= 4 ): # Verifica se tem tempo sobrando caso execute mais uma ação. Se não tiver, inicia o plano de voltar para a base
                 self.libPlan.pop(0)
-                self.libPlan.append(plano)
+                self.libPlan.append(self.createBaseReturnPlan())
 
     """Printa as estatísticas do agente: 
     pve: Porcentual de vítimas encontradas pelo Agente Explorador no tempo Te
@@ -256,9 +310,18 @@ class AgentExplorer:
     veg: Porcentual ponderado de vítimas encontradas por gravidade
     """
     def printStatistics(self):
-        print("\nNúmero de vítimas encontradas: ", len(self.prob.getVictims()))
-        print("Tempo total gasto pelo agente: ", self.costAll)
-        print("pve: ", self.getPve(), "\ntve: ", self.getTve(), "\nveg: ", self.getVeg(), "\n")
+        statistics = self.getStatistics()
+        print("\nNúmero de vítimas encontradas: ", statistics["found"])
+        print("Tempo total gasto pelo agente: ", statistics["cost"])
+        print("pve: ", statistics["pve"], "\ntve: ", statistics["tve"], "\nveg: ", statistics["veg"], "\n")
+
+    """Retorna as estatísticas do agente (as mesmas de printStatistics) em um dicionário"""
+    def getStatistics(self):
+        return {"found": self.prob.getNumberOfFoundVictims(),
+                "cost": self.costAll,
+                "pve": self.getPve(),
+                "tve": self.getTve(),
+                "veg": self.getVeg()}
 
     """
     Pega a gravidade das vítimas que o agente encontrou durante a exploração e cria um vetor com o número de vítimas por gravidade.
@@ -266,9 +329,7 @@ class AgentExplorer:
     """
     def getFoundVictimsSeverity(self):
         severityArray = [0 for col in range(5)]
-        victims = self.prob.getVictims()
-        for victim in victims:
-            victimId = self.prob.mazeBeliefs[victim[0]][victim[1]]
+        for victimId in self.prob.victims.values():
             vitalSignals = self.model.getVictimVitalSignals(victimId)[0]
             victimSeverity = vitalSignals[len(vitalSignals)-1]
             severityArray[int(victimSeverity//25+1)] += 1
@@ -296,7 +357,7 @@ class AgentExplorer:
     """
     def getPve(self):
         totalVictims = self.model.getNumberOfVictims()
-        foundVictims = len(self.prob.getVictims())
+        foundVictims = self.prob.getNumberOfFoundVictims()
         return foundVictims/totalVictims
 
     """
@@ -305,7 +366,7 @@ class AgentExplorer:
     te = tempo efetivamente gasto para localizar vítimas e voltar a base (pode ser menor ou igual à Te)
     """
     def getTve(self):
-        foundVictims = len(self.prob.getVictims())
+        foundVictims = self.prob.getNumberOfFoundVictims()
         if not (foundVictims):
             return math.inf
         return (self.totalTime-self.time)/foundVictims
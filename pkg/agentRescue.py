@@ -16,19 +16,41 @@ from random import randint
 ## Importa o algoritmo para o plano
 from greedyPathPlan import GreedyPathPlan
 from geneticPlan import GeneticPlan
+from anytimeRescuePlan import AnytimeRescuePlan
+from orienteeringPlan import OrienteeringPlan
+from heapGreedyPlan import HeapGreedyPlan
+from nullProfiler import NullProfiler
+from nullTraceLog import NullTraceLog
 
 ## Classe que define o Agente de resgate
 class AgentRescue:
-    def __init__(self, model, problem, time, debug_mode):
+    def __init__(self, model, problem, time, debug_mode, pathCache = None, islands = 1, anytime = False, planner = "genetic", lookahead = 3,
+                 plan = None, agentIndex = 0, profiler = None, trace = None, distanceFields = False):
         """ 
         Construtor do agente rescue
         @param model referencia o ambiente onde o agente estah situado
         @param problem: crenças do agente
         @param time: tempo para execução
+        @param pathCache: PathCache usado pelo plano para não recalcular a tabela de caminhos entre as vítimas
+        @param islands: número de ilhas (processos) do algoritmo genético
+        @param anytime: começa a andar com o plano guloso enquanto o algoritmo genético roda em segundo plano (ver AnytimeRescuePlan)
+        @param planner: plano usado quando anytime é False: "genetic" (GeneticPlan), "greedy" (GreedyPathPlan), "heap" (HeapGreedyPlan)
+        ou "orienteering" (OrienteeringPlan)
+        @param lookahead: número de vítimas olhadas à frente pelo plano "heap"
+        @param plan: plano já calculado para o agente (ex.: RescueAllocation.planFor); se informado, planner é ignorado
+        @param agentIndex: índice do agente no modelo (ver Model.addAgent)
+        @param profiler: Profiler que mede o tempo da construção do plano e de cada fase do ciclo de raciocínio (None: sem medição)
+        @param trace: TraceLog onde é registrado cada ciclo de raciocínio (None: sem registro)
+        @param distanceFields: calcula a tabela de caminhos entre as vítimas com os campos de distância do NumPy (ver distanceField)
         """
 
         self.debug = debug_mode
         self.model = model
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        self.trace = trace if trace is not None else NullTraceLog()
+        self.cycles = 0
+        self.agentIndex = agentIndex
+        self.model.activateAgent(agentIndex)
 
         ## Obtem o tempo que tem para executar
         self.time = time
@@ -62,8 +84,22 @@ class AgentRescue:
         self.costAll = 0
 
         ## Cria a instancia do plano para decidir o caminho a seguir
-        # self.plan = GreedyPathPlan(self.prob, initial, time)
-        self.plan = GeneticPlan(self.prob, initial, time)
+        # self.plan = GreedyPathPlan(self.prob, initial, time, pathCache=pathCache)
+        start = _time.perf_counter()
+        if plan is not None:
+            self.plan = plan
+        elif anytime:
+            self.plan = AnytimeRescuePlan(self.prob, initial, time, useDistanceFields=distanceFields, pathCache=pathCache, geneticOptions={"islands": islands})
+        elif planner == "greedy":
+            self.plan = GreedyPathPlan(self.prob, initial, time, useDistanceFields=distanceFields, pathCache=pathCache)
+        elif planner == "heap":
+            self.plan = HeapGreedyPlan(self.prob, initial, time, useDistanceFields=distanceFields, pathCache=pathCache, lookahead=lookahead)
+        elif planner == "orienteering":
+            self.plan = OrienteeringPlan(self.prob, initial, time, useDistanceFields=distanceFields, pathCache=pathCache)
+        else:
+            self.plan = GeneticPlan(self.prob, initial, time, useDistanceFields=distanceFields, pathCache=pathCache, islands=islands)
+        if plan is None:
+            self.profilePlan(_time.perf_counter() - start)
 
         ## Adiciona o(s) planos a biblioteca de planos do agente
         self.libPlan = [self.plan]
@@ -79,6 +115,9 @@ class AgentRescue:
         if not (self.canKeepExecuting()): 
             return -1
 
+        # Os sensores e atuadores do modelo passam a ser os deste agente (ver Model.activateAgent)
+        self.model.activateAgent(self.agentIndex)
+
         # Atualiza o plano que irá executar
         self.plan = self.libPlan[0]
 
@@ -87,8 +126,12 @@ class AgentRescue:
             print("\n*** Inicio do ciclo raciocinio ***")
             print("Pos agente no amb.: ", self.positionSensor())
 
+        self.cycles += 1
+        self.profiler.count("resgate.ciclos")
+
         # Redefine o estado atual do agente de acordo com o resultado da execução da ação do ciclo anterior
-        self.updateCurrentState()
+        with self.profiler.phase("resgate.updateCurrentState"):
+            self.updateCurrentState()
 
         # Funcionou ou nao, vou somar o custo da acao com o total 
         self.costAll += self.prob.getActionCost(self.previousAction)
@@ -99,10 +142,14 @@ class AgentRescue:
         self.time -= self.prob.getActionCost(self.previousAction)
         if(self.debug):
             print("Tempo disponivel: ", self.time)
+        cost, remaining = self.costAll, self.time
 
         # Define a proxima acao a ser executada e executa-a
         self.executeNextAction()
 
+        # Registra o ciclo (ver TraceLog)
+        self.trace.cycle("resgate", self.agentIndex, self.cycles, self.currentState, cost, remaining, self.previousAction, self.expectedState)
+
         return 1
 
     ## Metodo que executa as acoes
@@ -112,7 +159,8 @@ class AgentRescue:
         @return 1 caso movimentacao tenha sido executada corretamente """
 
         ## Passa a acao para o modelo
-        result = self.model.go(action)
+        with self.profiler.phase("resgate.model.go"):
+            result = self.model.go(action)
         
         ## Se o resultado for True, significa que a acao foi completada com sucesso, e ja pode ser removida do plano
         ## if (result[1]): ## atingiu objetivo ## TACLA 20220311
@@ -120,6 +168,18 @@ class AgentRescue:
         ##    self.actionDo((2,1), True)
             
 
+    def profilePlan(self, seconds):
+        """Registra no profiler o tempo de construção do plano (em segundos), os nós expandidos pelas buscas de caminho
+        e, no algoritmo genético, as avaliações de fitness e as gerações"""
+        name = type(self.plan).__name__
+        self.profiler.record(name, seconds)
+        pathFinder = getattr(self.plan, "pathFinder", None)
+        if pathFinder is not None:
+            self.profiler.count(name + ".expansoes", pathFinder.expansions)
+        if isinstance(self.plan, GeneticPlan):
+            self.profiler.count(name + ".avaliacoes", self.plan.evaluations)
+            self.profiler.count(name + ".geracoes", self.plan.generations)
+
     ## Metodo que pega a posicao real do agente no ambiente
     def positionSensor(self):
         """Simula um sensor que realiza a leitura do posição atual no ambiente.
@@ -169,7 +229,8 @@ class AgentRescue:
         """
     def executeNextAction(self):
         # Escolhe a próxima ação de acordo com o plano que está sendo executado
-        result = self.plan.chooseAction()
+        with self.profiler.phase("resgate.chooseAction"):
+            result = self.plan.chooseAction()
         # result é uma tupla na forma: <direcao>, <state>
         action = result[0]
         expectedState = result[1]
@@ -191,4 +252,10 @@ class AgentRescue:
     def printMetrics(self):
         V = self.model.getNumberOfVictims()
         victimsVitalSignals = [self.model.getVictimVitalSignals(victimId)[0] for victimId in range(1, V+1)]
-        self.plan.printMetrics(self.costAll, victimsVitalSignals, V)
\ No newline at end of file
+        self.plan.printMetrics(self.costAll, victimsVitalSignals, V)
+
+    def getMetrics(self):
+        """Retorna as métricas do plano de resgate (pvs, tvs, vsg, ...) em um dicionário"""
+        V = self.model.getNumberOfVictims()
+        victimsVitalSignals = [self.model.getVictimVitalSignals(victimId)[0] for victimId in range(1, V+1)]
+        return self.plan.getMetrics(self.costAll, victimsVitalSignals, V)
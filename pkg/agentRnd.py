@@ -14,6 +14,7 @@ from random import randint
 ## Importa o algoritmo para o plano
 from randomPlan import RandomPlan
 from baseReturnPlan import BaseReturnPlan
+from nullTraceLog import NullTraceLog
 
 ##Importa o Planner
 sys.path.append(os.path.join("pkg", "planner"))
@@ -21,13 +22,17 @@ from planner import Planner
 
 ## Classe que define o Agente
 class AgentRnd:
-    def __init__(self, model, configDict):
+    def __init__(self, model, configDict, trace = None):
         """ 
         Construtor do agente random
         @param model referencia o ambiente onde o agente estah situado
+        @param trace: TraceLog onde é registrado cada ciclo de raciocínio; se informado, o raciocínio não é impresso
         """
 
         self.model = model
+        self.trace = trace if trace is not None else NullTraceLog()
+        self.debug = trace is None
+        self.cycles = 0
 
         ## Obtem o tempo que tem para executar
         self.time = configDict["Te"]
@@ -71,12 +76,15 @@ class AgentRnd:
         if not (self.canKeepExecuting()): 
             return -1
 
+        self.cycles += 1
+
         # Atualiza o plano que irá executar
         self.plan = self.libPlan[0]
 
         # Inicia o raciocínio do agente
-        print("\n*** Inicio do ciclo raciocinio ***")
-        print("Pos agente no amb.: ", self.positionSensor())
+        if(self.debug):
+            print("\n*** Inicio do ciclo raciocinio ***")
+            print("Pos agente no amb.: ", self.positionSensor())
 
         # Redefine o estado atual do agente de acordo com o resultado da execução da ação do ciclo anterior
         self.updateCurrentState()
@@ -86,11 +94,14 @@ class AgentRnd:
 
         # Funcionou ou nao, vou somar o custo da acao com o total 
         self.costAll += self.prob.getActionCost(self.previousAction)
-        print ("Custo até o momento (com a ação escolhida):", self.costAll) 
+        if(self.debug):
+            print ("Custo até o momento (com a ação escolhida):", self.costAll) 
 
         # consome o tempo gasto
         self.time -= self.prob.getActionCost(self.previousAction)
-        print("Tempo disponivel: ", self.time)
+        if(self.debug):
+            print("Tempo disponivel: ", self.time)
+        cost, remaining = self.costAll, self.time
         
         # Verifica se tem alguma vítima na posição atual do robô
         self.checkForVictim()
@@ -98,6 +109,9 @@ class AgentRnd:
         # Define a proxima acao a ser executada e executa-a
         self.executeNextAction()
 
+        # Registra o ciclo (ver TraceLog)
+        self.trace.cycle("aleatorio", 0, self.cycles, self.currentState, cost, remaining, self.previousAction, self.expectedState)
+
         return 1
 
     ## Metodo que executa as acoes
@@ -149,8 +163,10 @@ class AgentRnd:
         ## Verifica se tem vitima na posicao atual    
         victimId = self.victimPresenceSensor()
         if victimId > 0 and not self.prob.isVictimInPosition(self.currentState): #Se encontrei vítima e ela ainda não está no mapa: tenho que adicionar a posição da vítima no mapa
-            print ("vitima encontrada em ", self.currentState, " id: ", victimId, " sinais vitais: ", self.victimVitalSignalsSensor(victimId))
-            self.getVictimVitalSignals(victimId)
+            vitalSignals = self.getVictimVitalSignals(victimId)
+            if(self.debug):
+                print ("vitima encontrada em ", self.currentState, " id: ", victimId, " sinais vitais: ", vitalSignals)
+            self.trace.victimFound("aleatorio", 0, self.cycles, self.currentState, victimId, vitalSignals)
             self.addVictimToMap(self.currentState, victimId)
 
     """Checa os sinais vitais da vítima especificada e consome o tempo dessa ação.
@@ -197,14 +213,17 @@ class AgentRnd:
     def updateCurrentState(self):
         self.currentState = self.positionSensor()
         self.plan.updateCurrentState(self.currentState) # atualiza o current state no plano
-        print("Ag cre que esta em: ", self.currentState)
+        if(self.debug):
+            print("Ag cre que esta em: ", self.currentState)
 
     """Verifica se a ação foi executada com sucesso:
     Se ela tiver funcionado, adiciono a posição atual como uma posição explorada no mapa
     Se ela não tiver funcionado, adiciono a posição que eu esperava estar como uma posição com parede no mapa"""
     def checkPreviousExecution(self):
         if not (self.currentState == self.expectedState): #Ação não funcionou: tenho que marcar uma parede no mapa
-            print("---> erro na execucao da acao ", self.previousAction, ": esperava estar em ", self.expectedState, ", mas estou em ", self.currentState)
+            if(self.debug):
+                print("---> erro na execucao da acao ", self.previousAction, ": esperava estar em ", self.expectedState, ", mas estou em ", self.currentState)
+            self.trace.actionError("aleatorio", 0, self.cycles, self.previousAction, self.expectedState, self.currentState)
             self.addWallToMap(self.expectedState)
         else: #Ação funcionou: tenho que marcar o mapa como explorado
             if not(self.prob.isVictimInPosition(self.currentState)):
@@ -218,7 +237,8 @@ class AgentRnd:
         # result é uma tupla na forma: <direcao>, <state>
         action = result[0]
         expectedState = result[1]
-        print("Ag deliberou pela acao: ", action, " o estado resultado esperado é: ", expectedState)
+        if(self.debug):
+            print("Ag deliberou pela acao: ", action, " o estado resultado esperado é: ", expectedState)
 
         # Executa a próxima ação e atualiza a previousAction e o expectedState para verificar
         # no próximo ciclo se a ação funcionou
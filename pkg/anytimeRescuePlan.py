@@ -0,0 +1,114 @@
+import threading
+
+from greedyPathPlan import GreedyPathPlan
+from geneticPlan import GeneticPlan
+
+
+class AnytimeRescuePlan(GreedyPathPlan):
+    def __init__(self, problem, startState, time, name="caminhoAnytime", useDistanceFields=False, pathCache=None, pathMethod="astar",
+                 geneticOptions=None):
+        """
+        Plano de resgate "anytime": o agente começa a andar imediatamente seguindo as escolhas do plano guloso
+        (ver GreedyPathPlan.chooseNextGoal) enquanto o algoritmo genético (GeneticPlan) roda em uma thread.
+        Sempre que o agente chega em uma vítima (ou está na base) e o algoritmo genético já terminou, compara o que
+        ainda seria salvo continuando com o plano guloso e seguindo o resto do melhor cromossomo, com o tempo restante;
+        se o cromossomo salvar mais (gravidade total maior, ou igual com custo menor), passa a segui-lo até o fim.
+        @param problem: crenças do agente (contém o mapa criado durante a exploração)
+        @param startState: coordenada de início do robô
+        @param time: tempo que o plano tem para ser executado
+        @param name: nome do plano
+        @param useDistanceFields: calcula as distâncias com campos de distância do NumPy (ver distanceField)
+        @param pathCache: PathCache com as tabelas de caminhos já calculadas em execuções anteriores
+        @param pathMethod: algoritmo de busca de caminho ("astar" ou "jps", ver PathFinder)
+        @param geneticOptions: dicionário com parâmetros extras para GeneticPlan (ex.: islands, timeBudget)
+        """
+        super().__init__(problem, startState, time, name, useDistanceFields, pathCache, pathMethod)
+
+        # tour do algoritmo genético adotado (None enquanto o agente segue o plano guloso)
+        self.tour = None
+        self.geneticPlan = None
+        self.switchedAt = None # número de vítimas socorridas quando o plano passou a seguir o cromossomo
+
+        # o algoritmo genético reaproveita a tabela de caminhos já calculada e pode ser interrompido quando o resgate termina
+        self.cancel = threading.Event()
+        options = dict(geneticOptions or {})
+        options.update(subPathTable=self.subPathTable, cancel=self.cancel)
+        self.worker = threading.Thread(target=self.runGenetic, args=(self.prob.snapshot(), time, options), daemon=True)
+        self.worker.start()
+
+    def runGenetic(self, problem, time, options):
+        """ Executado na thread: roda o algoritmo genético a partir da base, sobre uma cópia das crenças (ver Problem.snapshot)
+        para não ler o mapa enquanto ele é alterado pelo ciclo do agente """
+        self.geneticPlan = GeneticPlan(problem, self.startCoordinate, time, **options)
+
+    def stop(self):
+        """ Interrompe o algoritmo genético, se ele ainda estiver rodando """
+        self.cancel.set()
+
+    def chooseNextGoal(self):
+        """ Escolhe a próxima parada: segue o tour do algoritmo genético se ele já foi adotado (ou se passou a valer
+        a pena agora), senão usa a escolha do plano guloso """
+        pos = (self.currentState.row, self.currentState.col)
+        if self.tour is None and self.geneticPlan is not None and not self.worker.is_alive():
+            self.checkSwitch(pos)
+
+        if self.tour is not None:
+            best_victim, best_path = self.nextTourGoal(pos, self.savedVictims, self.time)
+        else:
+            best_victim, best_path = self.bestNextGoal(pos, self.savedVictims, self.time)
+        self.path = list(best_path) # cópia: o caminho é consumido durante a execução
+
+        if best_victim is None: # voltando para a base (ou já nela): o resgate terminou
+            self.stop()
+
+    def nextTourGoal(self, pos, savedVictims, time):
+        """ Próxima vítima do tour ainda não socorrida, com a mesma regra do cromossomo em GeneticPlan: se não der tempo
+        de ir até ela e depois voltar para a base, o tour termina e o agente volta para a base
+        @return tupla (vítima escolhida ou None para voltar à base, caminho até ela)"""
+        basePos = (self.startCoordinate.row, self.startCoordinate.col)
+        for victim in self.tour:
+            if victim in savedVictims:
+                continue
+            subpath, cost = self.subPathTable[pos][victim]
+            if cost + self.subPathTable[victim][basePos][1] > time:
+                break
+            return victim, subpath
+        return None, self.subPathTable[pos][basePos][0]
+
+    def simulate(self, chooseGoal, pos):
+        """ Simula o resto do resgate a partir de pos, usando as tabelas de custo, sem executar nada
+        @param chooseGoal: função (pos, vítimas socorridas, tempo) -> (vítima ou None, caminho), ex.: bestNextGoal
+        @param pos: posição atual
+        @return tupla (gravidade total das vítimas que ainda seriam salvas, custo total até voltar para a base)"""
+        basePos = (self.startCoordinate.row, self.startCoordinate.col)
+        saved = list(self.savedVictims)
+        time = self.time
+        gravity = 0
+        cost = 0
+        while True:
+            victim, path = chooseGoal(pos, saved, time)
+            if victim is None:
+                return gravity, cost + self.subPathTable[pos][basePos][1]
+            legCost = self.subPathTable[pos][victim][1]
+            cost += legCost
+            time -= legCost
+            gravity += self.getGravity(victim)
+            saved.append(victim)
+            pos = victim
+
+    def checkSwitch(self, pos):
+        """ Adota o tour do algoritmo genético se, a partir daqui, ele salva mais do que continuar com o plano guloso """
+        greedyGravity, greedyCost = self.simulate(self.bestNextGoal, pos)
+        self.tour = self.geneticPlan.bestTour
+        tourGravity, tourCost = self.simulate(self.nextTourGoal, pos)
+        if (tourGravity, -tourCost) > (greedyGravity, -greedyCost):
+            self.switchedAt = len(self.savedVictims)
+        else:
+            self.tour = None # compara de novo na próxima vítima
+
+    def printMetrics(self, totalCost, victimsVitalSignals, numVictims):
+        super().printMetrics(totalCost, victimsVitalSignals, numVictims)
+        if self.switchedAt is None:
+            print("Plano do algoritmo genético não foi adotado")
+        else:
+            print("Plano do algoritmo genético adotado depois de socorrer ", self.switchedAt, " vítimas")
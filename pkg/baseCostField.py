@@ -0,0 +1,92 @@
+from heapq import heappush, heappop
+import math
+
+from pathFinder import PathFinder
+
+
+class BaseCostField:
+    def __init__(self, problem):
+        """
+        Custo mínimo de cada posição conhecida até a base, mantido de forma incremental enquanto o mapa de crenças muda.
+        Quando um local passa a ser livre (explorado ou vítima), só os custos que diminuem são propagados a partir dele
+        (Dijkstra parcial); quando um local livre passa a ser parede, o campo é recalculado inteiro (não acontece na exploração).
+        Assim o custo para voltar para a base é consultado em O(1), sem uma busca nova a cada ciclo.
+        Deve ser registrado como observador do problema (Problem.addObserver) para receber as mudanças no mapa.
+        @param problem: crenças do agente (contém o mapa criado durante a exploração e a posição da base)
+        """
+        self.prob = problem
+        self.pathFinder = PathFinder(problem)
+        self.root = (problem.basePosition.row, problem.basePosition.col)
+
+        # custo até a base das posições livres alcançáveis a partir dela
+        self.costs = dict()
+        self.recompute()
+
+    def recompute(self):
+        """ Recalcula o campo inteiro com um Dijkstra a partir da base """
+        self.costs = dict()
+        if self.pathFinder.isPossibleToMove(self.root):
+            self.costs[self.root] = 0
+            self.propagate([(0, self.root)])
+
+    def propagate(self, frontier):
+        """ Dijkstra a partir das posições da fronteira, atualizando só os custos que diminuem.
+        Os movimentos são simétricos, então o custo da base até a posição é igual ao custo da posição até a base.
+        @param frontier: lista de tuplas (custo, posição) de onde a propagação começa"""
+        while frontier:
+            cost, current = heappop(frontier)
+            if cost > self.costs.get(current, math.inf):
+                continue
+            for offset in self.pathFinder.offsets:
+                neighbor = (current[0] - offset[0], current[1] - offset[1])
+                newCost = cost + self.pathFinder.d(current, offset, neighbor)
+                if newCost < self.costs.get(neighbor, math.inf):
+                    self.costs[neighbor] = newCost
+                    heappush(frontier, (newCost, neighbor))
+
+    def cellChanged(self, row, col, oldValue, newValue):
+        """ Chamado pelo problema quando uma posição do mapa de crenças muda
+        @param row: linha da posição
+        @param col: coluna da posição
+        @param oldValue: valor anterior no mapa
+        @param newValue: novo valor no mapa"""
+        wasPassable = oldValue >= 0
+        isPassable = newValue >= 0
+        if wasPassable == isPassable: # ex.: local explorado que passou a ter uma vítima
+            return
+        if not isPassable:
+            self.recompute()
+            return
+
+        # A nova posição livre pode diminuir o custo dela mesma e, pelas diagonais que ela libera, o dos vizinhos:
+        # a propagação recomeça a partir dos vizinhos que já têm custo (e da base, se for ela)
+        frontier = []
+        pos = (row, col)
+        if pos == self.root:
+            self.costs[pos] = 0
+            heappush(frontier, (0, pos))
+        for offset in self.pathFinder.offsets:
+            neighbor = (row - offset[0], col - offset[1])
+            if neighbor in self.costs:
+                heappush(frontier, (self.costs[neighbor], neighbor))
+        self.propagate(frontier)
+
+    def mazeChanged(self):
+        """ Chamado pelo problema quando o mapa de crenças inteiro é substituído """
+        self.recompute()
+
+    def getCost(self, state):
+        """ Custo mínimo para ir da posição até a base (inf se não houver caminho).
+        Como em A*, a posição não precisa ser um local conhecido: basta conseguir sair dela para um vizinho.
+        @param state: State com a posição"""
+        pos = (state.row, state.col)
+        if pos == self.root:
+            return 0
+        if pos in self.costs:
+            return self.costs[pos]
+        best = math.inf
+        for offset in self.pathFinder.offsets:
+            neighbor = (pos[0] - offset[0], pos[1] - offset[1])
+            if neighbor in self.costs:
+                best = min(best, self.pathFinder.d(pos, offset, neighbor) + self.costs[neighbor])
+        return best
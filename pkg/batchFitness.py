@@ -0,0 +1,51 @@
+import numpy as np
+from array import array
+
+
+class BatchFitness:
+    def __init__(self, costs, gravities, time):
+        """
+        Calcula o fitness de GeneticPlan para a população inteira de uma vez, com operações do NumPy sobre a matriz
+        da população (um cromossomo por linha), em vez de percorrer cada cromossomo no Python.
+        Retorna exatamente os mesmos valores de GeneticPlan.fitness.
+        @param costs: matriz (V+1)x(V+1) com o custo entre cada par de posições; os índices 0..V-1 são as vítimas
+        (na ordem de victimsPositions) e o índice V é a base
+        @param gravities: gravidade de cada vítima (na ordem de victimsPositions)
+        @param time: tempo disponível para o resgate
+        """
+        self.costs = np.asarray(costs, dtype=float)
+        self.base = len(self.costs) - 1
+        self.returnCosts = self.costs[:, self.base].copy()
+        self.gravities = np.asarray(gravities, dtype=float)
+        self.time = time
+
+    def evaluate(self, population):
+        """ Fitness de cada cromossomo: soma das gravidades das vítimas salvas + 1/custo total.
+        O cromossomo é seguido enquanto houver tempo para ir até a próxima vítima e depois voltar para a base.
+        @param population: matriz PxV, lista de listas ou lista de array('H') com os índices das vítimas de cada cromossomo
+        @return array com o fitness de cada cromossomo"""
+        if len(population) > 0 and isinstance(population[0], array):
+            # cromossomos de GeneticPlan: os bytes de todos formam a matriz diretamente, sem converter gene por gene
+            data = b"".join(cromossomo.tobytes() for cromossomo in population)
+            population = np.frombuffer(data, dtype=np.uint16).reshape(len(population), -1)
+        population = np.asarray(population, dtype=np.intp)
+        size, length = population.shape
+
+        current = np.full(size, self.base, dtype=np.intp)
+        accCost = np.zeros(size)
+        gravitySaved = np.zeros(size)
+        alive = np.ones(size, dtype=bool) # cromossomos que ainda não pararam por falta de tempo
+
+        for k in range(length):
+            following = population[:, k]
+            cost = self.costs[current, following]
+            # mesma ordem das somas de fitness, para obter exatamente os mesmos valores
+            alive &= (accCost + cost) + self.returnCosts[following] <= self.time
+            if not alive.any():
+                break
+            accCost += np.where(alive, cost, 0)
+            gravitySaved += np.where(alive, self.gravities[following], 0)
+            current = np.where(alive, following, current)
+
+        accCost += self.returnCosts[current]
+        return gravitySaved + 1 / accCost
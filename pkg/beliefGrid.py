@@ -0,0 +1,106 @@
+from array import array
+
+
+class BeliefGrid:
+    def __init__(self, rows, columns, fill=-1):
+        """
+        Matriz de inteiros compacta (2 bytes por posição) usada como mapa de crenças do agente e como mapa de paredes
+        e vítimas do labirinto. Os valores ficam em um único array('h') em ordem de linha (índice = linha * colunas + coluna),
+        em vez de uma lista de listas de objetos int do Python.
+        No mapa de crenças continua valendo a codificação dos planos: -1 local não explorado, 0 explorado, -2 parede
+        e número maior que 0 vítima (id da vítima).
+        @param rows: número de linhas
+        @param columns: número de colunas
+        @param fill: valor inicial de todas as posições
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cells = array('h', [fill]) * (rows * columns)
+
+        # True enquanto cells é compartilhado com uma cópia criada por snapshot (copy-on-write)
+        self.shared = False
+
+    @staticmethod
+    def fromRows(rows):
+        """ Cria a matriz a partir de uma lista de listas (ex.: mapa antigo em Problem.setMaze) """
+        grid = BeliefGrid(len(rows), len(rows[0]) if rows else 0)
+        grid.cells = array('h', [value for row in rows for value in row])
+        return grid
+
+    def index(self, row, col):
+        """ Índice da posição no array (ordem de linha) """
+        return row * self.columns + col
+
+    def position(self, index):
+        """ Posição (linha, coluna) correspondente ao índice do array """
+        return divmod(index, self.columns)
+
+    def get(self, row, col):
+        return self.cells[row * self.columns + col]
+
+    def set(self, row, col, value):
+        if self.shared: # só copia o array na primeira escrita depois do snapshot
+            self.cells = array('h', self.cells)
+            self.shared = False
+        self.cells[row * self.columns + col] = value
+
+    def snapshot(self):
+        """ Cópia do estado atual da matriz. Os dados só são copiados quando uma das duas matrizes for alterada. """
+        copy = BeliefGrid(0, 0)
+        copy.rows = self.rows
+        copy.columns = self.columns
+        copy.cells = self.cells
+        copy.shared = True
+        self.shared = True
+        return copy
+
+    def positionsWithValue(self, value):
+        """ Lista (em ordem de linha) das posições (linha, coluna) que têm o valor especificado.
+        A busca é feita nos bytes do array (bytes.find), sem passar por cada posição no Python. """
+        positions = []
+        data = self.cells.tobytes()
+        pattern = array('h', [value]).tobytes()
+        size = self.cells.itemsize
+        index = data.find(pattern)
+        while index != -1:
+            if index % size == 0:
+                positions.append(divmod(index // size, self.columns))
+                index = data.find(pattern, index + size)
+            else: # casou com o fim de uma posição e o começo da seguinte
+                index = data.find(pattern, index + 1)
+        return positions
+
+    def positionsWhere(self, predicate):
+        """ Lista (em ordem de linha) das posições (linha, coluna) cujo valor satisfaz predicate
+        @param predicate: função que recebe o valor e retorna True ou False """
+        columns = self.columns
+        return [divmod(index, columns) for index, value in enumerate(self.cells) if predicate(value)]
+
+    def tobytes(self):
+        return self.cells.tobytes()
+
+    def __array__(self, dtype=None, copy=None):
+        """ Visão NumPy (linhas x colunas, int16, somente leitura) dos mesmos dados, sem cópia """
+        import numpy as np
+        grid = np.frombuffer(self.cells, dtype=np.int16).reshape(self.rows, self.columns)
+        grid.flags.writeable = False
+        if dtype is not None:
+            grid = grid.astype(dtype, copy=False)
+        return grid
+
+    # Compatibilidade com o acesso antigo grid[linha][coluna] (somente leitura): cada linha é uma memoryview do array.
+    # As alterações devem passar por set (ou Problem.updateMazePosition) para respeitar o copy-on-write.
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError("linha fora do mapa")
+        start = row * self.columns
+        return memoryview(self.cells)[start:start + self.columns].toreadonly()
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
@@ -0,0 +1,167 @@
+import numpy as np
+
+
+class DistanceField:
+    # Variação das coordenadas para chegar em cada um dos 8 vizinhos
+    offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+    def __init__(self, beliefs, source):
+        """
+        Campo de custo até source para todas as posições do mapa, calculado por propagação de frente de onda
+        com operações vetorizadas do NumPy (uma linha inteira do mapa por vez, sem laço por célula).
+        Usa as mesmas regras de d() dos planos: custo 1 para movimentos ortogonais, 1.5 para diagonais,
+        só passa por locais explorados (valor >= 0) e não corta o canto de paredes ou de locais desconhecidos.
+        @param beliefs: mapa de crenças do agente (Problem.mazeBeliefs ou array de inteiros linhas x colunas)
+        @param source: coordenada (linha, coluna) de origem do campo
+        """
+        self.beliefs = np.asarray(beliefs, dtype=np.int16)
+        self.rows, self.columns = self.beliefs.shape
+        self.source = tuple(source)
+        self.passable = self.beliefs >= 0
+
+        self.weights = self.edgeWeights()
+        self.costs = self.propagate()
+
+    def edgeWeights(self):
+        """ Para cada direção, array com o custo de ir de cada posição até o vizinho naquela direção
+        (inf se o movimento não for possível). A posição de origem do movimento não precisa ser conhecida. """
+        padded = np.zeros((self.rows + 2, self.columns + 2), dtype=bool)
+        padded[1:-1, 1:-1] = self.passable
+        weights = []
+        for dRow, dCol in self.offsets:
+            valid = padded[1+dRow:1+dRow+self.rows, 1+dCol:1+dCol+self.columns].copy()
+            if dRow != 0 and dCol != 0:
+                # na diagonal as duas posições laterais também precisam ser livres
+                valid &= padded[1+dRow:1+dRow+self.rows, 1:1+self.columns]
+                valid &= padded[1:1+self.rows, 1+dCol:1+dCol+self.columns]
+                cost = 1.5
+            else:
+                cost = 1.0
+            weights.append(np.where(valid, cost, np.inf))
+        return weights
+
+    # Valores auxiliares da propagação dentro de uma linha: SENTINEL representa posições sem custo e
+    # SEGMENT separa os trechos livres de uma linha (os valores continuam exatos em float64)
+    SENTINEL = 1e7
+    SEGMENT = 1e8
+
+    def propagateRow(self, costs, passable, segments, index):
+        """ Propaga os custos ao longo de uma linha (movimentos ortogonais de custo 1), nos dois sentidos,
+        sem atravessar paredes ou locais desconhecidos. Usa o mínimo acumulado do NumPy em cada trecho livre.
+        @param costs: custos da linha
+        @param passable: posições livres da linha
+        @param segments: id do trecho livre de cada posição (soma acumulada das posições bloqueadas)
+        @param index: índice de cada coluna"""
+        values = np.where(passable, costs, self.SENTINEL)
+        leftToRight = np.minimum.accumulate(values - index - segments * self.SEGMENT) + index + segments * self.SEGMENT
+        rightToLeft = np.minimum.accumulate((values + index + segments * self.SEGMENT)[::-1])[::-1] - index - segments * self.SEGMENT
+        best = np.minimum(leftToRight, rightToLeft)
+        best[best >= self.SENTINEL / 2] = np.inf
+        best[~passable] = np.inf
+        return best
+
+    def propagate(self):
+        """ Propaga a frente de onda a partir de source. Cada passada percorre as linhas de cima para baixo e de
+        baixo para cima; cada linha é atualizada de uma vez a partir da linha vizinha (movimentos verticais e
+        diagonais) e depois ao longo dela mesma. As passadas se repetem até o campo não mudar mais. """
+        costs = np.full((self.rows, self.columns), np.inf)
+        if not self.passable[self.source]:
+            return costs
+        costs[self.source] = 0
+
+        passable = self.passable
+        index = np.arange(self.columns, dtype=float)
+        segments = np.cumsum(~passable, axis=1).astype(float)
+
+        # up[r]: custo entre (r, c) e (r-1, c); upLeft[r]: entre (r, c) e (r-1, c-1); upRight[r]: entre (r, c) e (r-1, c+1)
+        up = np.full((self.rows, self.columns), np.inf)
+        upLeft = np.full((self.rows, self.columns), np.inf)
+        upRight = np.full((self.rows, self.columns), np.inf)
+        up[1:] = np.where(passable[1:] & passable[:-1], 1.0, np.inf)
+        upLeft[1:, 1:] = np.where(passable[1:, 1:] & passable[:-1, :-1] & passable[:-1, 1:] & passable[1:, :-1], 1.5, np.inf)
+        upRight[1:, :-1] = np.where(passable[1:, :-1] & passable[:-1, 1:] & passable[:-1, :-1] & passable[1:, 1:], 1.5, np.inf)
+
+        changed = True
+        while changed:
+            changed = False
+            for r in range(self.rows): # de cima para baixo
+                row = costs[r].copy()
+                if r > 0:
+                    previous = costs[r-1]
+                    np.minimum(row, previous + up[r], out=row)
+                    np.minimum(row[1:], previous[:-1] + upLeft[r, 1:], out=row[1:])
+                    np.minimum(row[:-1], previous[1:] + upRight[r, :-1], out=row[:-1])
+                row = np.minimum(row, self.propagateRow(row, passable[r], segments[r], index))
+                if (row < costs[r]).any():
+                    costs[r] = row
+                    changed = True
+            for r in range(self.rows - 2, -1, -1): # de baixo para cima
+                row = costs[r].copy()
+                following = costs[r+1]
+                np.minimum(row, following + up[r+1], out=row)
+                np.minimum(row[:-1], following[1:] + upLeft[r+1, 1:], out=row[:-1])
+                np.minimum(row[1:], following[:-1] + upRight[r+1, :-1], out=row[1:])
+                row = np.minimum(row, self.propagateRow(row, passable[r], segments[r], index))
+                if (row < costs[r]).any():
+                    costs[r] = row
+                    changed = True
+        return costs
+
+    def isCoordinateValid(self, coord):
+        """ Verifica se é uma coordenada dentro das fronteiras do mapa """
+        return coord[0] >= 0 and coord[1] >= 0 and coord[0] < self.rows and coord[1] < self.columns
+
+    def getCost(self, pos):
+        """ Custo mínimo para ir de pos até source (inf se não houver caminho).
+        Como em A*, pos não precisa ser um local conhecido: basta conseguir sair dele para um vizinho. """
+        pos = tuple(pos)
+        if pos == self.source:
+            return 0
+        if self.passable[pos]:
+            return float(self.costs[pos])
+        best = np.inf
+        for (dRow, dCol), weight in zip(self.offsets, self.weights):
+            neighbor = (pos[0] + dRow, pos[1] + dCol)
+            if self.isCoordinateValid(neighbor):
+                best = min(best, weight[pos] + self.costs[neighbor])
+        return float(best)
+
+    def getPath(self, pos):
+        """ Caminho de pos até source (sem pos), descendo o campo de custo. Vazio se não houver caminho. """
+        pos = tuple(pos)
+        path = []
+        remaining = self.getCost(pos)
+        if remaining == np.inf:
+            return path
+        while pos != self.source:
+            for (dRow, dCol), weight in zip(self.offsets, self.weights):
+                neighbor = (pos[0] + dRow, pos[1] + dCol)
+                if self.isCoordinateValid(neighbor) and weight[pos] + self.costs[neighbor] == remaining:
+                    remaining = float(self.costs[neighbor])
+                    pos = neighbor
+                    path.append(pos)
+                    break
+        return path
+
+
+def subPathTable(beliefs, basePos, positions):
+    """ Mesma tabela de PathFinder.subPathTable (origem -> destino -> (caminho, custo)), mas calculada
+    com um campo de distância por destino; pares sem caminho ficam com caminho vazio e custo 0.
+    @param beliefs: mapa de crenças do agente
+    @param basePos: coordenada da base
+    @param positions: coordenadas das vítimas"""
+    beliefs = np.asarray(beliefs, dtype=np.int16)
+    table = dict()
+    for pos in [basePos] + list(positions):
+        table[pos] = dict()
+    for target in [basePos] + list(positions):
+        field = DistanceField(beliefs, target)
+        for pos in table:
+            if pos == target and pos != basePos:
+                continue
+            cost = field.getCost(pos)
+            if cost == np.inf:
+                table[pos][target] = ([], 0)
+            else:
+                table[pos][target] = (field.getPath(pos), cost)
+    return table
@@ -0,0 +1,78 @@
+## TIME DE EXPLORADORES
+### Vários agentes exploradores no mesmo ambiente, todos partindo da base, com as crenças compartilhadas:
+### cada parede e vítima descoberta por um deles entra imediatamente no mapa de todos.
+import math
+
+from problem import Problem
+from baseCostField import BaseCostField
+from agentExplorer import AgentExplorer
+
+
+class ExplorerTeam:
+    def __init__(self, model, time, debug_mode, size, explorer = "frontier", profiler = None, trace = None):
+        """
+        Cria size exploradores (AgentExplorer) no modelo, todos na posição do agente do modelo (a base).
+        Eles compartilham o mesmo Problem (mapa de crenças, vítimas e sinais vitais) e o mesmo campo de custos até a base;
+        com o plano "frontier", os destinos de cada um ficam em claims para que os outros escolham regiões diferentes
+        (ver FrontierExplorationPlan). Os exploradores agem um de cada vez, um ciclo de cada por rodada (ver deliberate),
+        e cada um tem o seu próprio tempo Te.
+        @param model: referencia o ambiente onde os agentes estão situados
+        @param time: tempo para execução de cada explorador
+        @param debug_mode: imprime o raciocínio dos agentes
+        @param size: número de exploradores
+        @param explorer: plano de exploração de cada agente ("frontier" ou "dfs", ver AgentExplorer); com "dfs" as crenças
+        são compartilhadas, mas os destinos não são coordenados
+        @param profiler: Profiler compartilhado pelos exploradores (None: sem medição)
+        @param trace: TraceLog compartilhado pelos exploradores (None: sem registro)
+        """
+        self.model = model
+        self.time = time
+
+        base = model.agentPos
+        self.prob = Problem(model.rows, model.columns)
+        self.prob.defBasePosition(base[0], base[1])
+        self.baseCostField = BaseCostField(self.prob)
+        self.prob.addObserver(self.baseCostField)
+
+        # destino atual de cada explorador com o plano "frontier": índice do agente -> posição
+        self.claims = dict()
+
+        self.explorers = []
+        for i in range(size):
+            index = 0 if i == 0 else model.addAgent()
+            self.explorers.append(AgentExplorer(model, time, debug_mode, explorer, self, index, profiler, trace))
+        self.active = list(self.explorers)
+
+    def deliberate(self):
+        """ Uma rodada: cada explorador que ainda não terminou executa um ciclo
+        @return -1 quando todos terminaram, 1 caso contrário """
+        for agent in list(self.active):
+            if agent.deliberate() == -1:
+                self.active.remove(agent)
+            if agent.plan.name != "explorar": # voltando para a base (ou terminou): libera o destino para os outros
+                self.claims.pop(agent.agentIndex, None)
+
+        if not self.active:
+            self.model.activateAgent(0) # o agente de resgate usa a posição do primeiro agente
+            self.printStatistics()
+            return -1
+        return 1
+
+    def printStatistics(self):
+        statistics = self.getStatistics()
+        print("\nExploradores: ", len(self.explorers))
+        print("Número de vítimas encontradas: ", statistics["found"])
+        print("Tempo total gasto pelos agentes: ", statistics["cost"])
+        print("pve: ", statistics["pve"], "\ntve: ", statistics["tve"], "\nveg: ", statistics["veg"], "\n")
+
+    def getStatistics(self):
+        """ Estatísticas do time (as mesmas de AgentExplorer.getStatistics). O custo é a soma dos custos dos agentes e o
+        tve usa o tempo do explorador que demorou mais, já que eles exploram ao mesmo tempo. """
+        first = self.explorers[0]
+        found = self.prob.getNumberOfFoundVictims()
+        elapsed = max(agent.totalTime - agent.time for agent in self.explorers)
+        return {"found": found,
+                "cost": sum(agent.costAll for agent in self.explorers),
+                "pve": first.getPve(),
+                "tve": elapsed / found if found else math.inf,
+                "veg": first.getVeg()}
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+
+class FitnessCache:
+    def __init__(self, costs, gravities, time, maxEntries=200000):
+        """
+        Memoização do fitness de GeneticPlan para o cálculo cromossomo por cromossomo (sem o NumPy).
+        Depois de algumas gerações a maior parte da população é formada por cópias dos mesmos cromossomos (sobreviventes
+        e descendentes que não sofreram mutação), então o fitness de cada cromossomo já avaliado é guardado em uma cache
+        LRU limitada, indexada pelos bytes do array('H') do cromossomo. Os que não estão na cache são calculados com a
+        matriz de custos (listas indexadas pelos índices das vítimas), sem as tuplas de possibleSubPaths.
+        Retorna exatamente os mesmos valores de GeneticPlan.fitness.
+        @param costs: matriz (V+1)x(V+1) com o custo entre cada par de posições; o índice V é a base (ver GeneticPlan.costMatrix)
+        @param gravities: gravidade de cada vítima (na ordem de victimsPositions)
+        @param time: tempo disponível para o resgate
+        @param maxEntries: número máximo de cromossomos guardados; acima disso os usados há mais tempo são descartados
+        """
+        self.costs = costs
+        self.base = len(costs) - 1
+        self.returnCosts = [row[self.base] for row in costs]
+        self.gravities = gravities
+        self.time = time
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+
+        # estatísticas de uso da cache
+        self.hits = 0
+        self.misses = 0
+
+    def fitness(self, cromossomo):
+        """ Fitness do cromossomo (array('H') com os índices das vítimas), da cache se ele já foi avaliado """
+        key = cromossomo.tobytes()
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.compute(cromossomo)
+        self.entries[key] = value
+        if len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+        return value
+
+    def compute(self, cromossomo):
+        """ Mesmo cálculo de GeneticPlan.fitness: soma das gravidades das vítimas salvas + 1/custo total """
+        returnCosts = self.returnCosts
+        atual = self.base
+        custos = self.costs[atual]
+        acc_cost = 0
+        gravity_saved = 0
+        for proximo in cromossomo:
+            cost = custos[proximo]
+            if acc_cost + cost + returnCosts[proximo] > self.time:
+                break
+            gravity_saved += self.gravities[proximo]
+            acc_cost += cost
+            atual = proximo
+            custos = self.costs[atual]
+        return gravity_saved + 1/(acc_cost + returnCosts[atual])
+
+    def hitRate(self):
+        """ Fração das avaliações respondidas pela cache """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+    def __getstate__(self):
+        """ Ao copiar o plano para os processos das ilhas, os cromossomos guardados não são copiados: cada processo monta a sua cache """
+        state = self.__dict__.copy()
+        state["entries"] = OrderedDict()
+        return state
@@ -0,0 +1,187 @@
+from heapq import heappush, heappop
+import math
+
+from state import State
+from pathFinder import PathFinder
+
+
+class FrontierExplorationPlan:
+    # Variação das coordenadas para chegar em cada um dos 4 vizinhos ortogonais
+    orthogonal = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    movePos = {"N": (-1, 0),
+               "S": (1, 0),
+               "L": (0, 1),
+               "O": (0, -1),
+               "NE": (-1, 1),
+               "NO": (-1, -1),
+               "SE": (1, 1),
+               "SO": (1, -1)}
+
+    def __init__(self, problem, startState, name="explorar", pathMethod="astar", claims=None, agentId=0, spread=3):
+        """
+        Plano para explorar o mapa indo sempre para a fronteira mais próxima: a fronteira é o conjunto dos locais
+        conhecidos e livres (explorados ou com vítima) que têm um vizinho ortogonal ainda não explorado (-1).
+        O conjunto é mantido de forma incremental a partir das mudanças no mapa de crenças, como em BaseCostField, e o
+        plano deve ser registrado como observador do problema (Problem.addObserver).
+        A cada escolha, uma busca de custo uniforme sobre os locais conhecidos (movimentos 8-conectados com os custos de
+        PathFinder.d) encontra o local desconhecido mais barato de alcançar a partir da posição atual; o último passo
+        entra nele (ortogonal, ou na diagonal se os dois cantos forem livres, para que uma falha só signifique parede no
+        destino). O caminho é seguido até o fim ou até o destino deixar de ser desconhecido. Quando a fronteira fica
+        vazia a exploração termina (nop), como em OnlineDFSPlan.
+        Com vários exploradores sobre as mesmas crenças (ver ExplorerTeam), cada plano registra o seu destino em claims e
+        evita os locais a até spread posições (distância de Chebyshev) dos destinos dos outros; se só sobrarem locais
+        próximos deles, aceita qualquer um que não seja o destino de outro explorador e, por último, qualquer um.
+        @param problem: crenças do agente (onde irá ser salvo o mapa da exploração)
+        @param startState: coordenada de início do robô
+        @param name: nome do plano
+        @param pathMethod: algoritmo de busca de caminho de PathFinder (só as regras de movimento são usadas aqui)
+        @param claims: dicionário compartilhado entre os exploradores: id do explorador -> destino atual
+        @param agentId: id deste explorador em claims
+        @param spread: distância mínima do destino até os destinos dos outros exploradores
+        """
+        self.name = name
+        self.initialState = startState
+        self.currentState = startState
+        self.prob = problem
+        self.pathFinder = PathFinder(problem, pathMethod)
+
+        # locais livres com algum vizinho ortogonal desconhecido
+        self.frontier = set()
+        self.rebuildFrontier()
+
+        # caminho (lista de posições ainda não percorridas) até o local desconhecido escolhido como destino
+        # e posição em que o agente deve estar se o último passo funcionou
+        self.path = []
+        self.target = None
+        self.expected = (startState.row, startState.col)
+
+        # destinos dos exploradores que exploram as mesmas crenças
+        self.claims = claims if claims is not None else dict()
+        self.agentId = agentId
+        self.spread = spread
+
+        # número de buscas feitas para escolher um destino (uma por destino, salvo quando o passo falha)
+        self.searches = 0
+
+    def updateCurrentState(self, state):
+        self.currentState = state
+
+    def isFrontier(self, row, col):
+        """ Verifica se o local é livre e tem um vizinho ortogonal ainda não explorado """
+        if not self.pathFinder.isWalkable(row, col):
+            return False
+        for dRow, dCol in self.orthogonal:
+            if self.isUnknown(row + dRow, col + dCol):
+                return True
+        return False
+
+    def isUnknown(self, row, col):
+        """ Verifica se é uma coordenada dentro do mapa que ainda não foi explorada """
+        return 0 <= row < self.prob.maxRows and 0 <= col < self.prob.maxColumns and self.prob.mazeBeliefs.get(row, col) == -1
+
+    def updateFrontier(self, row, col):
+        """ Atualiza a presença do local na fronteira """
+        if self.isFrontier(row, col):
+            self.frontier.add((row, col))
+        else:
+            self.frontier.discard((row, col))
+
+    def rebuildFrontier(self):
+        """ Monta a fronteira a partir do mapa inteiro """
+        self.frontier = set()
+        for row, col in self.prob.mazeBeliefs.positionsWhere(lambda value: value >= 0):
+            self.updateFrontier(row, col)
+
+    def cellChanged(self, row, col, oldValue, newValue):
+        """ Chamado pelo problema quando uma posição do mapa de crenças muda: só ela e os seus vizinhos ortogonais podem
+        entrar ou sair da fronteira """
+        self.updateFrontier(row, col)
+        for dRow, dCol in self.orthogonal:
+            self.updateFrontier(row + dRow, col + dCol)
+
+    def mazeChanged(self):
+        """ Chamado pelo problema quando o mapa de crenças inteiro é substituído """
+        self.rebuildFrontier()
+        self.path = []
+        self.expected = None
+
+    def entryCost(self, current, offset, neighbor):
+        """ Custo do passo de um local livre para um local desconhecido (inf se o passo não deve ser tentado).
+        Na diagonal os dois cantos precisam ser livres, senão uma falha não diria se a parede está no destino. """
+        if not self.isUnknown(neighbor[0], neighbor[1]):
+            return math.inf
+        if offset[0] == 0 or offset[1] == 0:
+            return 1
+        if self.pathFinder.isPossibleToMove((current[0] - offset[0], current[1])) and self.pathFinder.isPossibleToMove((current[0], current[1] - offset[1])):
+            return 1.5
+        return math.inf
+
+    def isClaimed(self, pos, spread):
+        """ Verifica se o local está a até spread posições do destino de outro explorador """
+        for agentId, target in self.claims.items():
+            if agentId != self.agentId and max(abs(pos[0] - target[0]), abs(pos[1] - target[1])) <= spread:
+                return True
+        return False
+
+    def searchFrontier(self, start, spread=0):
+        """ Busca de custo uniforme a partir de start pelos locais livres até retirar da fila o primeiro local desconhecido
+        que não está perto do destino de outro explorador (ver isClaimed)
+        @return caminho (sem start) até o local desconhecido mais barato de alcançar; vazio se não houver nenhum"""
+        self.searches += 1
+        costs = {start: 0}
+        cameFrom = dict()
+        heap = [(0, start)]
+        while heap:
+            cost, current = heappop(heap)
+            if cost > costs[current]:
+                continue
+            if self.isUnknown(current[0], current[1]):
+                if not self.isClaimed(current, spread):
+                    return self.pathFinder.reconstructPath(current, cameFrom)
+                continue # não dá para atravessar um local desconhecido
+            for offset in self.pathFinder.offsets:
+                neighbor = (current[0] - offset[0], current[1] - offset[1])
+                if current in self.frontier:
+                    step = min(self.pathFinder.d(current, offset, neighbor), self.entryCost(current, offset, neighbor))
+                else:
+                    step = self.pathFinder.d(current, offset, neighbor)
+                newCost = cost + step
+                if newCost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = newCost
+                    cameFrom[neighbor] = current
+                    heappush(heap, (newCost, neighbor))
+        return []
+
+    def getNextPosition(self):
+        """ Próximo passo até o destino atual. Escolhe um novo destino se o caminho acabou, se o passo anterior falhou
+        (o agente não está onde esperava, ou seja, encontrou uma parede) ou se o destino já foi descoberto.
+        return: tupla contendo a acao (direcao) e o estado futuro resultante da movimentacao """
+        position = (self.currentState.row, self.currentState.col)
+        if position != self.expected or (self.path and not self.isUnknown(self.target[0], self.target[1])):
+            self.path = []
+        if not self.path:
+            if self.frontier:
+                # longe dos destinos dos outros; senão, qualquer um que não seja o destino de outro; senão, qualquer um
+                # (no início, com todos na base, pode haver mais exploradores do que locais desconhecidos alcançáveis)
+                for spread in (self.spread, 0, -1):
+                    self.path = self.searchFrontier(position, spread)
+                    if self.path:
+                        break
+            if not self.path: # nada mais para explorar
+                self.claims.pop(self.agentId, None)
+                return "nop", self.currentState
+            self.target = self.path[-1]
+            self.claims[self.agentId] = self.target
+
+        move = self.path.pop(0)
+        self.expected = move
+        delta = (move[0] - position[0], move[1] - position[1])
+        action = list(self.movePos.keys())[list(self.movePos.values()).index(delta)]
+        return action, State(move[0], move[1])
+
+    def chooseAction(self):
+        """ Escolhe o proximo movimento. É a ação que vai ser executada pelo agente.
+        @return: tupla contendo a acao (direcao) e uma instância da classe State que representa a posição esperada após a execução
+        """
+        return self.getNextPosition()
@@ -1,18 +1,53 @@
 from state import State
+from pathFinder import PathFinder
+from islandModel import IslandModel
+from fitnessCache import FitnessCache
 import math
 import random
+import heapq
+import itertools
+from array import array
+import time as _time
+
+try:
+    import numpy as np
+    from batchFitness import BatchFitness
+except ImportError: # sem NumPy o fitness é calculado cromossomo por cromossomo e os sobreviventes são escolhidos com heapq
+    np = None
+    BatchFitness = None
 
 
 class GeneticPlan:
-    def __init__(self, problem, startState, time, name="caminhoGenetico"):
+    def __init__(self, problem, startState, time, name="caminhoGenetico", useDistanceFields=False, pathCache=None, pathMethod="astar", batchFitness=True,
+                 islands=1, migrationInterval=25, migrants=10, popSize=None, maxGens=None, stallGenerations=50, timeBudget=None,
+                 subPathTable=None, cancel=None, selection="roulette", tournamentSize=3,
+                 fitnessCache=True, fitnessCacheSize=200000):
         """
         Plano para escolher um caminho que tenta passar pelo máximo de vítimas possível,
         priorizando as de maior gravidade. Calcula inicialmente todas as distâncias entre
-        as posições das vítimas, utilizando o algoritmo A*.
+        as posições das vítimas, com uma busca de custo uniforme a partir de cada vítima (ver PathFinder).
         @param problem: crenças do agente (contém o mapa criado durante a exploração)
         @param startState: coordenada de início do robô
         @param time: tempo que o plano tem para ser executado
         @param name: nome do plano
+        @param useDistanceFields: calcula as distâncias com campos de distância do NumPy (ver distanceField)
+        @param pathCache: PathCache com as tabelas de caminhos já calculadas em execuções anteriores
+        @param pathMethod: algoritmo de busca de caminho ("astar" ou "jps", ver PathFinder)
+        @param batchFitness: calcula o fitness da população inteira de uma vez com o NumPy (ver BatchFitness), se ele estiver instalado
+        @param islands: número de subpopulações evoluídas em paralelo, uma por processo (ver IslandModel); 1 não usa processos
+        @param migrationInterval: número de gerações entre as migrações de cromossomos entre as ilhas
+        @param migrants: número de melhores cromossomos de cada ilha enviados para a ilha seguinte em cada migração
+        @param popSize: tamanho da população (padrão: proporcional ao número de vítimas, até 5000)
+        @param maxGens: número máximo de gerações (padrão: proporcional ao número de vítimas, até 250)
+        @param stallGenerations: para quando o melhor fitness não melhora por esse número de gerações (None: não para)
+        @param timeBudget: tempo máximo de execução do algoritmo genético, em segundos (None: sem limite)
+        @param subPathTable: tabela de caminhos já calculada por outro plano para as mesmas crenças (ver PathFinder.subPathTable)
+        @param cancel: threading.Event que, quando sinalizado, interrompe o algoritmo genético (ver AnytimeRescuePlan)
+        @param selection: seleção dos pais: "roulette" (roleta), "tournament" (torneio) ou uma função (população, k) -> lista
+        com k cromossomos (com ilhas, precisa ser uma função definida no nível de um módulo)
+        @param tournamentSize: número de cromossomos sorteados em cada torneio
+        @param fitnessCache: sem o cálculo com o NumPy, guarda o fitness dos cromossomos já avaliados (ver FitnessCache)
+        @param fitnessCacheSize: número máximo de cromossomos guardados em FitnessCache
         """
 
         # Inicializa as variáveis do plano
@@ -21,42 +56,25 @@ class GeneticPlan:
         self.currentState = startState
         self.startCoordinate = startState
         self.time = time
+        self.pathFinder = PathFinder(problem, pathMethod)
 
         # 
-        self.victimsPositions = []
-        for i in range(self.prob.maxRows):
-            for j in range(self.prob.maxColumns):
-                if(self.prob.mazeBeliefs[i][j] > 0): self.victimsPositions.append((i, j))
+        self.victimsPositions = self.prob.getVictimsPositions()
         
         self.savedVictims = []
         self.savedVictimsIds = []
-        self.possibleSubPaths = dict()
-
+        # caminhos e custos entre cada par de posições (base e vítimas): possibleSubPaths[origem][destino] = (caminho, custo)
         basePos = (startState.row, startState.col)
-        self.possibleSubPaths[basePos] = dict()
-        self.possibleSubPaths[basePos][basePos] = ([], 0)
-        for pos in self.victimsPositions:
-            path_to_base = self.a_star(pos, basePos)
-            path_from_base = list(reversed(path_to_base))
-            path_from_base.pop(0)
-            path_from_base.append(pos)
-
-            # print("a", end="")
-            self.possibleSubPaths[basePos][pos] = (path_from_base, self.calculatePathCost(basePos, path_from_base))
-
-            self.possibleSubPaths[pos] = dict()
-            self.possibleSubPaths[pos][basePos] = (path_to_base, self.calculatePathCost(pos, path_to_base))
-            for other in self.victimsPositions:
-                if (pos == other):
-                    continue
-                path = self.a_star(pos, other)
-                self.possibleSubPaths[pos][other] = (path, self.calculatePathCost(pos, path))
+        if subPathTable is not None:
+            self.possibleSubPaths = subPathTable
+        else:
+            self.possibleSubPaths = self.pathFinder.subPathTable(basePos, self.victimsPositions, useDistanceFields, pathCache)
 
         # self.orderedVictimsVitalSignals = []
         self.orderedVictimsGravity = []
         for v in self.victimsPositions:
-            victim_id = self.prob.mazeBeliefs[v[0]][v[1]]
-            vital_signals = next(filter(lambda x: x[0] == victim_id, self.prob.victimsVitalSignals), False)
+            victim_id = self.prob.mazeBeliefs.get(v[0], v[1])
+            vital_signals = self.prob.getVitalSignals(victim_id)
             gravity = math.floor((100 - vital_signals[6]) / 25) + 1
             # self.orderedVictimsVitalSignals.append(vital_signals)
             self.orderedVictimsGravity.append(gravity)
@@ -65,118 +83,61 @@ class GeneticPlan:
         # calculado no início, quando o algoritmo genético é executado
         self.path = []
         self.expectedCost = 0
+        self.bestTour = []
 
         # variáveis do algoritmo genético:
 
-        # tamanho da população (é também o tamanho da descendência)
-        self.popSize = 5000
+        # tamanho da população (é também o tamanho da descendência) e número máximo de gerações:
+        # com poucas vítimas há poucas permutações possíveis, então não vale a pena usar 5000 cromossomos e 250 gerações
+        numVictims = len(self.victimsPositions)
+        self.popSize = popSize if popSize is not None else min(5000, 100 + 100 * numVictims)
+        self.maxGens = maxGens if maxGens is not None else min(250, 20 + 10 * numVictims)
 
-        # número máximo de gerações
-        self.maxGens = 250
+        # critérios de parada antecipada
+        self.stallGenerations = stallGenerations
+        self.timeBudget = timeBudget
+        self.cancel = cancel
+
+        # gerações executadas e motivo da parada: "geracoes" (chegou em maxGens), "convergencia" (sem melhora
+        # por stallGenerations gerações), "tempo" (acabou timeBudget) ou "cancelado" (cancel foi sinalizado)
+        self.generations = 0
+        self.stopReason = None
+        # número de cromossomos avaliados (só no processo principal; as ilhas avaliam nos seus próprios processos)
+        self.evaluations = 0
 
         # probabilidades de crossover e mutação
         self.pCross = 0.9
+        self.selection = selection
+        self.tournamentSize = tournamentSize
         self.pMut = 1 - math.pow(0.5, 1/len(self.victimsPositions))
         # self.pMut = 0.01
 
+        # cálculo do fitness da população inteira de uma vez (None: um cromossomo por vez, com fitness)
+        self.batchFitness = None
+        if batchFitness and BatchFitness is not None:
+            self.batchFitness = BatchFitness(self.costMatrix(), self.orderedVictimsGravity, self.time)
+
+        # memoização do fitness cromossomo por cromossomo (o cálculo com o NumPy já avalia a população inteira de uma vez)
+        self.fitnessCache = None
+        if fitnessCache and self.batchFitness is None:
+            self.fitnessCache = FitnessCache(self.costMatrix(), self.orderedVictimsGravity, self.time, fitnessCacheSize)
+
+        # modelo de ilhas: subpopulações independentes que trocam os melhores cromossomos periodicamente
+        self.islands = islands
+        self.migrationInterval = migrationInterval
+        self.migrants = migrants
+
         # executa do algoritmo genético para encontrar o caminho a seguir
         self.algoritmoGenetico()
 
-    def a_star(self, start, end):
-        openSet = [start]
-        cameFrom = dict()
-        gScore = dict()
-        fScore = dict()
-        for i in range(self.prob.maxRows): # No início do algoritmo o custo para chegar em qualquer nó é infinito, e para chegar no atual é 0
-            for j in range(self.prob.maxColumns):
-                gScore[(i,j)] = math.inf
-                fScore[(i,j)] = math.inf
-        gScore[start] = 0
-        fScore[start] = 0
-
-        while(len(openSet) > 0): # Enquanto houverem nós na fronteira
-            current = self.getLowestFScoreFromOpenSet(openSet, fScore) # Pega o nó da fronteira com menor f(n)
-
-            if current == end: # Verifica se é a posição objetivo. Se for, retorna o caminho até o objetivo
-                return self.reconstructPath(current, cameFrom)
-
-            openSet.remove(current) # Remove o nó da fronteira
-
-            rowOffset = [-1, -1, -1,  0, 0,  1, 1, 1]
-            colOffset = [-1,  0,  1, -1, 1, -1, 0, 1]
-
-            for i in range(8): # Para cada vizinho do nó
-                neighbor = (current[0] - rowOffset[i], current[1] - colOffset[i])
-                if self.isCoordinateValid(neighbor): 
-                    tentative_gScore = gScore[current] + self.d(current, (rowOffset[i], colOffset[i]), neighbor) 
-                    if tentative_gScore < gScore[neighbor]: # Verifica se é possível melhorar o g(n) do vizinho
-                        cameFrom[neighbor] = current # Atualiza o nó de origem para ir até o viziho
-                        gScore[neighbor] = tentative_gScore # Atualiza g(n)
-                        fScore[neighbor] = tentative_gScore + self.calculateHeuristic(neighbor, end) # Atualiza f(n)
-                        if(neighbor not in openSet): # Adiciona o nó na fronteira se ele ainda não estiver nela
-                            openSet.append(neighbor)
-        return [] #Não há caminho    
-
-    def getLowestFScoreFromOpenSet(self, openSet, fScore):
-        """Retorna o nó da fronteira que tem o menor valor da função f(n)""" # Com um min-heap era só retornar o topo
-        lowest = openSet[0]
-        for item in openSet:
-            if fScore[item] < fScore[lowest]: lowest = item
-        return lowest
-
-    def reconstructPath(self, end, cameFrom):
-        """ Cria o caminho do robô a partir da informação de origem encontrada de cada posição,
-        começando do final.
-        O retorno é um vetor ordenado por ordem de visita dos nós para sair do nó inicial até o final
-        @param end: coordenada final do caminho"""
-        reversed_path = [end]
-        current = end
-        while current in cameFrom.keys():
-            current = cameFrom[current]
-            reversed_path.append(current)
-        path = list(reversed(reversed_path))
-        path.pop(0)
-        return path
-
-    def isCoordinateValid(self, coord):
-        """ Verifica se é uma coordenada dentro das fronteiras do mapa """
-        return coord[0] >= 0 and coord[1] >= 0 and coord[0] < self.prob.maxRows and coord[1] < self.prob.maxColumns
-
-    # Se for um local com parede o valor no mapa é -1, se for um local não explorado o valor é -2
-    def isPossibleToMove(self, pos):
-        """ Verifica se o agente pode se mover para a posição especificada. Para isso, verifica se há paredes nessa
-        coordenada ou se ela é um local desconheido. Caso não seja um desses casos, é possível mover até a posição.
-        @param pos: coordenada que se quer checar se é possível mover """
-        return self.prob.mazeBeliefs[pos[0]][pos[1]] >= 0 and self.isCoordinateValid(pos)
-
-    def d(self, current, offset, neighbor):
-        """ Custo para ir de um ponto até seu vizinho.
-        Verifica se a posição para onde está tentando ir é uma parede ou um local desconhecido. Se for, é impossível ir até o vizinho (inf)
-        Se for um local já explorado, se a ação não for de andar na diagonal, retorna o custo da ação.
-        Se for uma ação para andar na diagonal, verifica se há uma parede ou um local não explorado no caminho que possam impossibilitar o movimento.
-        Se tiver algo impossibilitando, retorna inf, senão, retorna o custo da ação
-        @param current: nó atual
-        @param offset: qual é a variação das coordenadas do nó atual para chegar até o vizinho
-        @param neighbor: nó vizinho"""
-        canMove = self.isPossibleToMove(neighbor)
-        if not (canMove): # Se passou daqui, neighbor é um local sem parede e que foi explorado
-            return math.inf
-
-        if (offset[0] == 0 or offset[1] == 0): # Se não tiver parede no lugar e não estou indo na diagonal o custo é 1
-            return 1
-
-        # Se estou indo pra diagonal, não é possível mover se tiver alguma parede no caminho ou se eu não explorei o local e não sei se tem parede ou não
-        canMove = self.isPossibleToMove((current[0] - offset[0], current[1])) and self.isPossibleToMove((current[0], current[1] - offset[1]))
-        if not (canMove): # Se passou daqui, é porque eu conheço os locais na lateral e não tem nada impossibilitando o movimento
-            return math.inf
-        return 1.5
-
-    # Heurística utilizada: distância pitagórica entre os 2 pontos - admissível e consistente
-    def calculateHeuristic(self, currentState, end):
-        """Calcula a distância pitagórica entre a coordenada atual e o objetivo
-        @param currentState: coordenada em que se encontra o robô"""
-        if end and currentState:
-            return math.sqrt(pow((end[0] - currentState[0]), 2) + pow((end[1] - currentState[1]), 2))
+    def __getstate__(self):
+        """ Estado copiado para os processos das ilhas (ver IslandModel): as crenças do agente não são necessárias
+        para evoluir a população, só a tabela de caminhos e os parâmetros do algoritmo genético """
+        state = self.__dict__.copy()
+        del state["prob"]
+        del state["pathFinder"]
+        state["cancel"] = None
+        return state
 
     def calculatePathCost(self, start, path):
         """ Retorna o custo do caminho calculado """
@@ -196,7 +157,7 @@ class GeneticPlan:
         pos = (state.row, state.col)
         if pos in self.victimsPositions and pos not in self.savedVictims:
             self.savedVictims.append(pos)
-            self.savedVictimsIds.append(self.prob.mazeBeliefs[pos[0]][pos[1]])
+            self.savedVictimsIds.append(self.prob.mazeBeliefs.get(pos[0], pos[1]))
 
     def getNextPosition(self):
         """ Desempilha o próximo movimento previsto. Se não há mais movimentos
@@ -226,16 +187,27 @@ class GeneticPlan:
         return self.getNextPosition()
     
     def printMetrics(self, totalCost, victimsVitalSignals, numVictims):
+        metrics = self.getMetrics(totalCost, victimsVitalSignals, numVictims)
+        print("Número de vítimas salvas: ", metrics["saved"])
+        print("Número de vítimas encontradas: ", metrics["found"])
+        print("Tempo total gasto pelo agente: ", metrics["cost"])
+        print("pvs: ", metrics["pvs"])
+        print("tvs: ", metrics["tvs"])
+        print("vsg: ", metrics["vsg"])
+        print("Gerações do algoritmo genético: ", self.generations, " (parada: ", self.stopReason, ")")
+        if self.fitnessCache is not None:
+            cache = self.fitnessCache
+            print("Cache do fitness: ", cache.hits, " acertos e ", cache.misses, " cálculos (",
+                  round(100 * cache.hitRate(), 1), "% de acertos)")
+
+    def getMetrics(self, totalCost, victimsVitalSignals, numVictims):
+        """ Calcula as métricas do resgate (as mesmas impressas por printMetrics) e as retorna em um dicionário """
         vs = len(self.savedVictims)
         V = numVictims
-        print("Número de vítimas salvas: ", vs)
-        print("Número de vítimas encontradas: ", len(self.victimsPositions))
-        print("Tempo total gasto pelo agente: ", totalCost)
-        print("pvs: ", vs / V)
         if not (vs):
-            print("tvs: ", math.inf)
+            tvs = math.inf
         else:
-            print("tvs: ", totalCost / vs)
+            tvs = totalCost / vs
         vsg = 0
         Vi = [0, 0, 0, 0]
         for v in victimsVitalSignals:
@@ -244,8 +216,12 @@ class GeneticPlan:
             if v[0] in self.savedVictimsIds:
                 vsg += i
         vsg = vsg / sum(Vi)
-        print("vsg: ", vsg)
-        pass
+        return {"saved": vs,
+                "found": len(self.victimsPositions),
+                "cost": totalCost,
+                "pvs": vs / V,
+                "tvs": tvs,
+                "vsg": vsg}
 
     def fitness(self, cromossomo):
         basePos = (self.startCoordinate.row, self.startCoordinate.col)
@@ -275,38 +251,66 @@ class GeneticPlan:
         return gravity_saved + 1/acc_cost
         # return gravity_saved
 
+    def costMatrix(self):
+        """ Matriz com o custo entre cada par de posições: os índices 0..V-1 são as vítimas (na ordem de
+        victimsPositions) e o índice V é a base """
+        basePos = (self.startCoordinate.row, self.startCoordinate.col)
+        positions = self.victimsPositions + [basePos]
+        costs = [[0 for j in positions] for i in positions]
+        for i, origin in enumerate(positions):
+            for j, destination in enumerate(positions):
+                if origin != destination or origin == basePos:
+                    costs[i][j] = self.possibleSubPaths[origin][destination][1]
+        return costs
+
+    def evaluate(self, cromossomos):
+        """ Retorna o fitness de cada cromossomo da lista (arrays com os índices das vítimas) """
+        self.evaluations += len(cromossomos)
+        if self.batchFitness is not None:
+            return self.batchFitness.evaluate(cromossomos).tolist()
+        if self.fitnessCache is not None:
+            return [self.fitnessCache.fitness(c) for c in cromossomos]
+        return [self.fitness(c) for c in cromossomos]
+
     def crossover(self, pai1, pai2):
+        """ Crossover PMX (partially mapped crossover) entre dois cromossomos, em O(V): a posição de cada vítima em
+        cada pai fica em um vetor (posição inversa), em vez de ser procurada com index a cada passo do reparo
+        @return os dois descendentes (cromossomos novos)"""
         sz = len(pai1)
         i = random.randrange(sz)
         j = random.randrange(i+1, sz+1)
-        d1 = pai1.copy()
-        d2 = pai2.copy()
-        set1 = set()
-        set2 = set()
+        d1 = array('H', pai1)
+        d2 = array('H', pai2)
         if j <= sz and i < (j-1):
+            posicao1 = [0] * sz # posicao1[v] = índice da vítima v em pai1
+            posicao2 = [0] * sz
+            for k in range(sz):
+                posicao1[pai1[k]] = k
+                posicao2[pai2[k]] = k
+            # vítimas que estão no trecho trocado de cada descendente
+            trecho1 = bytearray(sz)
+            trecho2 = bytearray(sz)
             for k in range(i, j):
                 d1[k] = pai2[k]
-                set1.add(d1[k])
+                trecho1[pai2[k]] = 1
 
                 d2[k] = pai1[k]
-                set2.add(d2[k])
+                trecho2[pai1[k]] = 1
             for k in range(i, j):
-                if pai1[k] not in set1:
+                if not trecho1[pai1[k]]:
                     index = k
-                    while index in range(i, j):
-                        val = pai2[index]
-                        index = pai1.index(val)
+                    while i <= index < j:
+                        index = posicao1[pai2[index]]
                     d1[index] = pai1[k]
-                    
-                if pai2[k] not in set2:
+
+                if not trecho2[pai2[k]]:
                     index = k
-                    while index in range(i, j):
-                        val = pai1[index]
-                        index = pai2.index(val)
+                    while i <= index < j:
+                        index = posicao2[pai1[index]]
                     d2[index] = pai2[k]
 
         return d1, d2
-    
+
     def mutate(self, cromossomo, indice):
         if random.random() <= 0.067:
             # tipo 1 de mutação, troca dois índices
@@ -322,15 +326,79 @@ class GeneticPlan:
             del cromossomo[indice]
             cromossomo.append(temp)
 
-    def algoritmoGenetico(self):
-        populacao_inicial = [random.sample(range(len(self.victimsPositions)), k=len(self.victimsPositions)) for i in range(self.popSize)]
-        populacao = [(c, self.fitness(c)) for c in populacao_inicial]
+    def select(self, populacao, k):
+        """ Sorteia k pais da população com a estratégia de seleção do plano (ver selection) """
+        if callable(self.selection):
+            return self.selection(populacao, k)
+        if self.selection == "tournament":
+            return self.tournamentSelection(populacao, k)
+        return self.rouletteSelection(populacao, k)
+
+    def rouletteSelection(self, populacao, k):
+        """ Método da roleta: a chance de cada cromossomo é proporcional ao fitness. Usa os pesos acumulados,
+        calculados uma vez, com random.choices """
+        cromossomos, fitness = zip(*populacao)
+        return random.choices(cromossomos, cum_weights=list(itertools.accumulate(fitness)), k=k)
+
+    def tournamentSelection(self, populacao, k):
+        """ Seleção por torneio: cada pai é o melhor entre tournamentSize cromossomos sorteados """
+        tamanho = len(populacao)
+        pais = []
+        for i in range(k):
+            melhor = populacao[random.randrange(tamanho)]
+            for j in range(self.tournamentSize - 1):
+                outro = populacao[random.randrange(tamanho)]
+                if outro[1] > melhor[1]:
+                    melhor = outro
+            pais.append(melhor[0])
+        return pais
+
+    def survivors(self, populacao, tamanho):
+        """ Mantém na população (no lugar) só os tamanho cromossomos de maior fitness, com seleção parcial
+        (argpartition do NumPy ou heapq.nlargest) em vez de ordenar a população inteira """
+        if len(populacao) <= tamanho:
+            return
+        if np is not None:
+            fitness = np.fromiter((f for c, f in populacao), dtype=float, count=len(populacao))
+            melhores = np.argpartition(fitness, len(populacao) - tamanho)[len(populacao) - tamanho:]
+            populacao[:] = [populacao[i] for i in melhores.tolist()]
+        else:
+            populacao[:] = heapq.nlargest(tamanho, populacao, key=lambda tup: tup[1])
 
+    def algoritmoGenetico(self):
+        if self.islands > 1:
+            melhor, self.generations, self.stopReason = IslandModel(self, self.islands, self.migrationInterval, self.migrants).run()
+        else:
+            populacao = self.initialPopulation(self.popSize)
+            self.generations, self.stopReason = self.evolve(populacao, self.maxGens, self.timeBudget)
+            melhor, melhor_fitness = max(populacao, key=lambda tup: tup[1])
+        self.buildPath(melhor)
+
+    def initialPopulation(self, size):
+        """ População inicial com size permutações aleatórias das vítimas, com o fitness de cada uma """
+        # cada cromossomo é um array('H') com a ordem dos índices das vítimas (2 bytes por gene)
+        populacao_inicial = [array('H', random.sample(range(len(self.victimsPositions)), k=len(self.victimsPositions))) for i in range(size)]
+        return list(zip(populacao_inicial, self.evaluate(populacao_inicial)))
+
+    def evolve(self, populacao, maxGens, timeBudget=None):
+        """ Executa até maxGens gerações do algoritmo genético sobre a população (lista de tuplas (cromossomo, fitness)),
+        que é alterada no lugar. Ao final ela mantém o tamanho (sem uma ordem definida).
+        Para antes se o melhor fitness não melhorar por stallGenerations gerações ou se acabar o tempo.
+        @param timeBudget: tempo máximo em segundos (None: sem limite)
+        @return tupla (gerações executadas, motivo da parada)"""
+        tamanho = len(populacao)
+        if timeBudget is not None:
+            deadline = _time.perf_counter() + timeBudget
+        melhor_fitness = max(f for c, f in populacao)
+        sem_melhora = 0
         geracoes = 0
-        while geracoes < self.maxGens:
+        while geracoes < maxGens:
+            if timeBudget is not None and _time.perf_counter() >= deadline:
+                return geracoes, "tempo"
+            if self.cancel is not None and self.cancel.is_set():
+                return geracoes, "cancelado"
             geracoes += 1
-            # um método da biblioteca padrão para fazer o método da roleta
-            descendentes = random.choices([c for c, f in populacao], [f for c, f in populacao], k=len(populacao))
+            descendentes = self.select(populacao, len(populacao))
 
             # um método manual de calcular os descendentes
             # descendentes = []
@@ -355,34 +423,44 @@ class GeneticPlan:
                     descendentes[i-1] = d1
                     descendentes[i] = d2
             
-            old_len = len(descendentes)
-            descendentes.extend(descendentes)
-            
-            for i in range(old_len):
-                for j in range(len(descendentes[i])):
+            # os descendentes entram na população sem mutação e também com mutação; as mutações são feitas em cópias,
+            # para não alterar os cromossomos que continuam na população (os que não passaram pelo crossover ainda
+            # são os mesmos objetos dos pais) nem os descendentes sem mutação
+            mutados = [array('H', c) for c in descendentes]
+            for cromossomo in mutados:
+                for j in range(len(cromossomo)):
                     sorteado = random.random()
                     if sorteado <= self.pMut:
-                        self.mutate(descendentes[i], j)
-                pass
+                        self.mutate(cromossomo, j)
+            descendentes = mutados + descendentes
 
-            populacao.extend([(c, self.fitness(c)) for c in descendentes])
+            populacao.extend(zip(descendentes, self.evaluate(descendentes)))
 
             # if self.maxGens - geracoes < 6 or geracoes < 6:
             #     melhor, melhor_fitness = max(populacao, key=lambda tup: tup[1])
             #     print(melhor_fitness)
                 # print(len(populacao))
             # seleciona os N com maior fitness
-            populacao.sort(key=lambda tup: tup[1])
-            del populacao[:-self.popSize]
+            self.survivors(populacao, tamanho)
+
+            melhor_geracao = max(f for c, f in populacao)
+            if melhor_geracao > melhor_fitness:
+                melhor_fitness = melhor_geracao
+                sem_melhora = 0
+            else:
+                sem_melhora += 1
+                if self.stallGenerations is not None and sem_melhora >= self.stallGenerations:
+                    return geracoes, "convergencia"
             # if self.maxGens - geracoes < 4 or geracoes < 4:
             #     melhor, melhor_fitness = max(populacao, key=lambda tup: tup[1])
             #     print(melhor_fitness)
                 # print(len(populacao))
+        return geracoes, "geracoes"
 
-
-        melhor, melhor_fitness = max(populacao, key=lambda tup: tup[1])
-
-        # cria caminho com o melhor
+    def buildPath(self, melhor):
+        """ Cria o caminho seguindo o cromossomo até onde der tempo de voltar para a base """
+        # ordem completa das vítimas no melhor cromossomo (usada por AnytimeRescuePlan para trocar de plano no meio do resgate)
+        self.bestTour = [self.victimsPositions[i] for i in melhor]
         basePos = (self.startCoordinate.row, self.startCoordinate.col)
         atual = basePos
         acc_cost = 0
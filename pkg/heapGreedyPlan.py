@@ -0,0 +1,117 @@
+import heapq
+
+from greedyPathPlan import GreedyPathPlan
+
+
+class HeapGreedyPlan(GreedyPathPlan):
+    def __init__(self, problem, startState, time, name="caminhoGulosoHeap", useDistanceFields=False, pathCache=None, pathMethod="astar",
+                 lookahead=3, beamWidth=8):
+        """
+        Variação de GreedyPathPlan que mantém, para cada posição de onde o agente parte, um heap com as vítimas ordenadas
+        pela razão gravidade/custo (custo de ir até a vítima e depois voltar para a base). A razão não depende do tempo
+        restante, então o heap é montado uma vez (na primeira vez que a posição é usada) e atualizado de forma preguiçosa:
+        as vítimas do topo que já foram socorridas ou que não cabem mais no tempo são descartadas de vez, já que o tempo
+        só diminui. Com lookahead 1 a escolha é a mesma de GreedyPathPlan (inclusive nos empates).
+        Com lookahead k > 1, a escolha olha k vítimas à frente com uma busca em feixe (beam search): cada sequência
+        parcial é estendida com as beamWidth melhores vítimas do heap da sua última posição, ficam as beamWidth
+        sequências com a melhor razão gravidade total/custo total (voltando para a base), e o agente vai para a primeira
+        vítima da melhor sequência completa.
+        @param problem: crenças do agente (contém o mapa criado durante a exploração)
+        @param startState: coordenada de início do robô
+        @param time: tempo que o plano tem para ser executado
+        @param name: nome do plano
+        @param useDistanceFields: calcula as distâncias com campos de distância do NumPy (ver distanceField)
+        @param pathCache: PathCache com as tabelas de caminhos já calculadas em execuções anteriores
+        @param pathMethod: algoritmo de busca de caminho ("astar" ou "jps", ver PathFinder)
+        @param lookahead: número de vítimas olhadas à frente em cada escolha
+        @param beamWidth: número de sequências mantidas (e de vítimas tentadas a partir de cada uma) em cada nível da busca
+        """
+        super().__init__(problem, startState, time, name, useDistanceFields, pathCache, pathMethod)
+        self.lookahead = lookahead
+        self.beamWidth = beamWidth
+        self.gravities = {victim: self.getGravity(victim) for victim in self.victimsPositions}
+
+        # heaps[origem]: lista de (-razão, ordem em possibleSubPaths, vítima, caminho, custo), montada sob demanda
+        self.heaps = dict()
+
+    def getHeap(self, pos):
+        """ Heap das vítimas a partir de pos (ver __init__). A ordem em possibleSubPaths desempata como em bestNextGoal. """
+        heap = self.heaps.get(pos)
+        if heap is None:
+            heap = []
+            for order, (victim, subpath, cost) in enumerate(self.possibleSubPaths[pos][1:]):
+                total_cost = cost + self.possibleSubPaths[victim][0][2]
+                heap.append((-self.gravities[victim] / total_cost, order, victim, subpath, cost))
+            heapq.heapify(heap)
+            self.heaps[pos] = heap
+        return heap
+
+    def bestNextGoal(self, pos, savedVictims, time):
+        """ Mesma interface de GreedyPathPlan.bestNextGoal. Com lookahead 1 os descartes do heap assumem que as chamadas
+        seguem a execução do plano (vítimas socorridas só aumentam e o tempo só diminui).
+        @return tupla (vítima escolhida ou None para voltar à base, caminho até ela)"""
+        if self.lookahead > 1:
+            return self.beamNextGoal(pos, savedVictims, time)
+
+        heap = self.getHeap(pos)
+        while heap:
+            ratio, order, victim, subpath, cost = heap[0]
+            if victim in savedVictims or cost + self.possibleSubPaths[victim][0][2] > time:
+                heapq.heappop(heap) # não volta a ser uma opção: a vítima já foi salva ou o tempo só diminui
+                continue
+            return victim, subpath
+        return None, self.possibleSubPaths[pos][0][1]
+
+    def candidates(self, pos, excluded, time):
+        """ Gera as vítimas a partir de pos em ordem de razão gravidade/custo, sem alterar o heap: percorre os nós do
+        heap com um segundo heap (de índices) que começa na raiz e recebe os filhos de cada nó retirado.
+        Só gera as vítimas que não estão em excluded e que ainda dá tempo de salvar e voltar para a base."""
+        heap = self.getHeap(pos)
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            for child in (2*i + 1, 2*i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            ratio, order, victim, subpath, cost = entry
+            if victim not in excluded and cost + self.possibleSubPaths[victim][0][2] <= time:
+                yield entry
+
+    def beamNextGoal(self, pos, savedVictims, time):
+        """ Escolha com a busca em feixe de profundidade lookahead (ver __init__) """
+        # sequência parcial: (razão com volta para a base, vítimas, posição final, custo acumulado, gravidade acumulada)
+        beam = [(0, (), pos, 0, 0)]
+        complete = []
+        for depth in range(self.lookahead):
+            extended = []
+            for score, victims, last, acc_cost, gravity in beam:
+                excluded = set(savedVictims)
+                excluded.update(victims)
+                children = 0
+                for ratio, order, victim, subpath, cost in self.candidates(last, excluded, time - acc_cost):
+                    new_cost = acc_cost + cost
+                    new_gravity = gravity + self.gravities[victim]
+                    new_score = new_gravity / (new_cost + self.possibleSubPaths[victim][0][2])
+                    extended.append((new_score, victims + (victim,), victim, new_cost, new_gravity))
+                    children += 1
+                    if children == self.beamWidth:
+                        break
+                if children == 0 and victims: # não cabe mais nenhuma vítima: a sequência termina aqui
+                    complete.append((score, victims, last, acc_cost, gravity))
+            if not extended:
+                break
+            # as sequências com a mesma razão ficam na ordem em que foram geradas (a ordem do heap)
+            extended.sort(key=lambda sequence: -sequence[0])
+            beam = extended[:self.beamWidth]
+        else:
+            complete.extend(beam)
+
+        if not complete:
+            return None, self.possibleSubPaths[pos][0][1]
+        best = max(complete, key=lambda sequence: sequence[0])
+        victim = best[1][0]
+        return victim, self.subPathTable[pos][victim][0]
+
+    def printMetrics(self, totalCost, victimsVitalSignals, numVictims):
+        super().printMetrics(totalCost, victimsVitalSignals, numVictims)
+        print("Busca em feixe: ", self.lookahead, " vítimas à frente, largura ", self.beamWidth)
@@ -0,0 +1,111 @@
+import heapq
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+# Plano (GeneticPlan) de cada processo da pool: é copiado uma vez, quando o processo é criado, e só é lido
+# depois disso, então a tabela de custos entre as vítimas é compartilhada por todas as ilhas do processo
+_plan = None
+
+
+def initIsland(plan):
+    global _plan
+    _plan = plan
+
+
+def evolveIsland(job):
+    """ Evolui uma ilha por algumas gerações dentro de um processo da pool
+    @param job: tupla (população, número de gerações, tempo restante em segundos ou None, semente do gerador aleatório)
+    @return tupla (população evoluída, gerações executadas, motivo da parada)"""
+    populacao, geracoes, timeBudget, seed = job
+    random.seed(seed)
+    geracoes, motivo = _plan.evolve(populacao, geracoes, timeBudget)
+    return populacao, geracoes, motivo
+
+
+class IslandModel:
+    def __init__(self, plan, islands, migrationInterval, migrants, processes=None):
+        """
+        Modelo de ilhas para o algoritmo genético de GeneticPlan: a população é dividida em subpopulações (ilhas)
+        que evoluem de forma independente, cada uma em um processo. A cada migrationInterval gerações, os melhores
+        cromossomos de cada ilha substituem os piores da ilha seguinte (em anel).
+        Os critérios de parada do plano (stallGenerations e timeBudget) valem para o conjunto das ilhas.
+        As sementes das ilhas são sorteadas com o gerador aleatório do processo principal, então o resultado
+        continua reprodutível com random.seed.
+        @param plan: GeneticPlan com a tabela de caminhos e os parâmetros do algoritmo genético
+        @param islands: número de ilhas
+        @param migrationInterval: número de gerações entre as migrações
+        @param migrants: número de cromossomos enviados por cada ilha em cada migração
+        @param processes: número de processos da pool (padrão: uma por ilha, até o número de CPUs)
+        """
+        self.plan = plan
+        self.islands = islands
+        self.migrationInterval = max(1, migrationInterval)
+        self.migrants = migrants
+        self.processes = processes or min(islands, os.cpu_count() or 1)
+
+        # a população total é dividida entre as ilhas
+        self.islandSize = math.ceil(plan.popSize / islands)
+
+    def migrate(self, populacoes):
+        """ Copia os melhores cromossomos de cada ilha para o lugar dos piores da ilha seguinte
+        @param populacoes: lista com a população de cada ilha"""
+        migrants = min(self.migrants, self.islandSize)
+        if migrants <= 0:
+            return
+        melhores = [heapq.nlargest(migrants, populacao, key=lambda tup: tup[1]) for populacao in populacoes]
+        for i, populacao in enumerate(populacoes):
+            piores = heapq.nsmallest(migrants, range(len(populacao)), key=lambda j: populacao[j][1])
+            for j, (c, f) in zip(piores, melhores[i-1]):
+                populacao[j] = (c[:], f)
+
+    def best(self, populacoes):
+        """ Melhor tupla (cromossomo, fitness) de todas as ilhas """
+        return max((max(populacao, key=lambda tup: tup[1]) for populacao in populacoes), key=lambda tup: tup[1])
+
+    def run(self):
+        """ Executa o algoritmo genético nas ilhas
+        @return tupla (melhor cromossomo encontrado, gerações executadas, motivo da parada)"""
+        inicio = time.perf_counter()
+        populacoes = [self.plan.initialPopulation(self.islandSize) for i in range(self.islands)]
+        melhor_fitness = self.best(populacoes)[1]
+        sem_melhora = 0
+        total = 0
+        motivo = "geracoes"
+
+        with Pool(self.processes, initializer=initIsland, initargs=(self.plan,)) as pool:
+            while total < self.plan.maxGens:
+                if self.plan.cancel is not None and self.plan.cancel.is_set():
+                    motivo = "cancelado"
+                    break
+                restante = None
+                if self.plan.timeBudget is not None:
+                    restante = self.plan.timeBudget - (time.perf_counter() - inicio)
+                    if restante <= 0:
+                        motivo = "tempo"
+                        break
+
+                geracoes = min(self.migrationInterval, self.plan.maxGens - total)
+                jobs = [(populacao, geracoes, restante, random.getrandbits(64)) for populacao in populacoes]
+                resultados = pool.map(evolveIsland, jobs)
+                populacoes = [populacao for populacao, executadas, motivoIlha in resultados]
+                executadas = max(executadas for populacao, executadas, motivoIlha in resultados)
+                total += executadas
+
+                if all(motivoIlha == "tempo" for populacao, executadas, motivoIlha in resultados):
+                    motivo = "tempo"
+                    break
+                if self.best(populacoes)[1] > melhor_fitness:
+                    melhor_fitness = self.best(populacoes)[1]
+                    sem_melhora = 0
+                else:
+                    sem_melhora += executadas
+                    if self.plan.stallGenerations is not None and sem_melhora >= self.plan.stallGenerations:
+                        motivo = "convergencia"
+                        break
+                if total < self.plan.maxGens:
+                    self.migrate(populacoes)
+
+        return self.best(populacoes)[0], total, motivo
@@ -5,28 +5,33 @@ import math
 ## Importa os tipos de malha disponíveis
 sys.path.append(os.path.join("pkg", "mesh"))
 import mapSquare, mapTriangle
+from beliefGrid import BeliefGrid
 
 ## Classe que define o labirinto onde o agente esta
 class Maze:
     """Maze representa um labirinto com paredes. A indexação das posições do labirinto é dada por par ordenado (linha, coluna).
     A linha inicial é zero e a linha máxima é (maxLin - 1). A coluna inicial é zero e a máxima é (maxCol - 1)."""
 
-    def __init__(self, maxRows, maxColumns, mesh = "square", screen = False, load = False):
+    def __init__(self, maxRows, maxColumns, mesh = "square", screen = False, load = False, vitalSignalsFile = False):
         """Construtor do labirinto
         @param maxRows: número de linhas do labirinto
         @param maxColumns: número de colunas do labirinto
         @param mesh: String com o nome da malha
         @param screen: Screen do pygame para a execucao
+        @param vitalSignalsFile: caminho do arquivo com os sinais vitais (padrão: config_data/sinais_vitais.txt)
         """
         self.maxRows = maxRows
         self.maxColumns = maxColumns
         self.screen = screen
+        self.vitalSignalsFile = vitalSignalsFile
+        if self.vitalSignalsFile == False:
+            self.vitalSignalsFile = os.path.join("config_data" ,"sinais_vitais.txt")
         # Matriz que representa o labirinto sendo as posições = 1 aquelas que contêm paredes
-        self.walls = [[0 for j in range(maxColumns)] for i in range(maxRows)]  
+        self.walls = BeliefGrid(maxRows, maxColumns, 0)
 
         # Matriz que representa as posicoes das vitimas sendo as posições >= 1 aquelas que contêm vitimas
         # cada vitima eh identificada por um numero inteiro sequencial (id)
-        self.victims = [[0 for j in range(maxColumns)] for i in range(maxRows)]
+        self.victims = BeliefGrid(maxRows, maxColumns, 0)
 
         # lista que contem os sinais vitais de cada uma das vitimas. É uma lista composta por sublistas 
         # onde o índice de uma sublista corresponde ao id da vítima (ver self.victims)
@@ -64,7 +69,7 @@ class Maze:
     def updateWalls(self):
        
         ## Metodo que atualiza a lista dos objetos (vitimas) que estao no labirinto
-        vs_file = open(os.path.join("config_data" ,"sinais_vitais.txt"),"r")
+        vs_file = open(self.vitalSignalsFile,"r")
 
         ## Pega a matriz com todos os lugares (seja quadrado ou triangulo)
         aux = self.board.getListPlaces()
@@ -73,11 +78,11 @@ class Maze:
                 ## Verifica o tipo do objeto, e coloca sua identificacao na matriz walls 
                 if j.itemInside == "Parede":
                     pos = j.ide
-                    self.walls[pos[0]][pos[1]] = 1
+                    self.walls.set(pos[0], pos[1], 1)
                 elif j.itemInside == "Vitima" or j.itemInside == "Vitimas":
                     pos = j.ide
                     self.numberOfVictims = self.numberOfVictims + 1
-                    self.victims[pos[0]][pos[1]] = self.numberOfVictims
+                    self.victims.set(pos[0], pos[1], self.numberOfVictims)
                     
                     vs_line = vs_file.readline()
                     if vs_line:
@@ -10,7 +10,8 @@ class MapSquare:
         @param sideSquare: Lado de cada quadrado
         @param screen: Screen do Pygame
         @param posBegin: Posicao de inicio
-        @param load: Nome do arquivo que contem o mapa inicial (com os objetos e suas posicoes)
+        @param load: Nome do arquivo que contem o mapa inicial (com os objetos e suas posicoes), ou o caminho
+        completo de um arquivo .txt fora da pasta config_data
         """
         
         self.width = width
@@ -57,7 +58,10 @@ class MapSquare:
             ## Cria um objeto para armazenar cada informação
             things = {}
             ## Le o arquivo
-            arq = open(os.path.join("config_data" ,self.load+".txt"),"r")
+            if self.load.endswith(".txt"):
+                arq = open(self.load,"r")
+            else:
+                arq = open(os.path.join("config_data" ,self.load+".txt"),"r")
             for line in arq:
                 ## O formato de cada linha é:
                 ## Nome x,y x,y x,y
@@ -1,16 +1,19 @@
 from view import View
+from nullView import NullView
 from maze import Maze
 
 class Model:
     """Model implementa um ambiente na forma de um labirinto com paredes e com um agente.
      A indexação da posição do agente é feita sempre por um par ordenado (lin, col). Ver classe Labirinto."""
 
-    def __init__(self, rows, columns, mesh, load):
+    def __init__(self, rows, columns, mesh, load, headless = False, vitalSignalsFile = False):
         """Construtor de modelo do ambiente físico (labirinto)
         @param rows: número de linhas do labirinto
         @param columns: número de colunas do labirinto
         @param mesh: define o tipo malha a ser usado
         @param load: define o nome do arquivo que contém o mapa a ser usado
+        @param headless: se True, não cria a janela do pygame (usa uma view que não desenha nada)
+        @param vitalSignalsFile: caminho do arquivo com os sinais vitais das vítimas (padrão: config_data/sinais_vitais.txt)
         """
         if rows <= 0:
             rows = 5
@@ -23,13 +26,18 @@ class Model:
 
         ## Seta a posicao do agente
         self.agentPos = [0,0]
+        ## Posições de todos os agentes no ambiente; agentPos é a do agente ativo (ver addAgent e activateAgent)
+        self.agents = [self.agentPos]
         ## Seta a posicao do objetivo
         self.goalPos = [0,0]
 
         ## Cria a view
-        self.view = View(self)
+        if headless:
+            self.view = NullView(self)
+        else:
+            self.view = View(self)
         ## Cria o labirinto
-        self.maze = Maze(rows,columns, self.mesh, self.view.getScreen(), load)
+        self.maze = Maze(rows,columns, self.mesh, self.view.getScreen(), load, vitalSignalsFile)
         ## Seta para o view o labirinto criado
         self.view.setBoard(self.maze.getBoard())
 
@@ -69,7 +77,7 @@ class Model:
             return -1
         
         ## vai para cima de uma parede
-        if self.maze.walls[to_row][to_col] == 1:
+        if self.maze.walls.get(to_row, to_col) == 1:
             return -1
 
         row_dif = to_row - from_row
@@ -77,8 +85,8 @@ class Model:
 
         ## vai na diagonal? Caso sim, nao pode ter paredes acima | dir. ou acima | esq. ou abaixo | dir. ou abaixo | esq.
         if (row_dif !=0 and col_dif != 0):
-            if (self.maze.walls[from_row + row_dif][from_col] == 1 or
-                self.maze.walls[from_row][from_col + col_dif] == 1):
+            if (self.maze.walls.get(from_row + row_dif, from_col) == 1 or
+                self.maze.walls.get(from_row, from_col + col_dif) == 1):
                 return -1
         
         return 1
@@ -95,13 +103,24 @@ class Model:
         if (col >= self.maze.maxColumns or row >= self.maze.maxRows):
             return -1
         
-        if self.maze.walls[row][col] == 1:
+        if self.maze.walls.get(row, col) == 1:
             return -1
 
         self.agentPos[0] = row
         self.agentPos[1] = col
         return 1
 
+    def addAgent(self):
+        """Adiciona mais um agente ao ambiente, na mesma posição do agente ativo.
+        @return índice do novo agente (ver activateAgent)"""
+        self.agents.append(list(self.agentPos))
+        return len(self.agents) - 1
+
+    def activateAgent(self, index):
+        """Define qual agente é movido por go e percebido pelos sensores (agentPos passa a ser a posição dele).
+        @param index: índice do agente (0 é o agente criado com o modelo)"""
+        self.agentPos = self.agents[index]
+
     ## Metodo que define a posicao do objetivo
     def setGoalPos(self, row, col):
         """Utilizada para colocar o objetivo na posição inicial.
@@ -112,7 +131,7 @@ class Model:
             return -1
         if (col >= self.maze.maxColumns or row >= self.maze.maxRows):
             return -1
-        if self.maze.walls[row][col] == 1:
+        if self.maze.walls.get(row, col) == 1:
             return -1
 
         self.goalPos[0] = row
@@ -176,7 +195,7 @@ class Model:
         
         row = self.agentPos[0]
         col = self.agentPos[1]
-        victimId = self.maze.victims[row][col]
+        victimId = self.maze.victims.get(row, col)
         return victimId
 
     ## Metodo que executa uma acao (de não movimento)
@@ -0,0 +1,17 @@
+from contextlib import nullcontext
+
+
+class NullProfiler:
+    """Profiler que não mede nada. Usado pelos agentes quando a instrumentação não foi pedida.
+    Implementa a mesma interface de Profiler, sem custo de medição."""
+    def __init__(self):
+        self.context = nullcontext()
+
+    def phase(self, name):
+        return self.context
+
+    def record(self, name, seconds):
+        pass
+
+    def count(self, name, value=1):
+        pass
@@ -0,0 +1,14 @@
+class NullTraceLog:
+    """Registro que não salva nada. Usado pelos agentes quando o registro do raciocínio não foi pedido.
+    Implementa a mesma interface de TraceLog; os registros nem chegam a ser montados."""
+    def cycle(self, agent, index, n, state, cost, time, action, expected):
+        pass
+
+    def actionError(self, agent, index, n, action, expected, state):
+        pass
+
+    def victimFound(self, agent, index, n, state, victimId, vitalSignals):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,27 @@
+class NullView:
+    """View que não desenha nada. Usada no modo headless, quando não há display disponível
+    (ex.: execução em containers de CI) ou quando só interessam os resultados da simulação.
+    Implementa a mesma interface de View, mas sem inicializar o pygame."""
+    def __init__(self, model):
+        self.model = model
+        self.board = False
+        self.step = "notbuild"
+
+    ## Não há tela: o labirinto é criado sem screen
+    def getScreen(self):
+        return False
+
+    ## Metodo que seta o labirinto
+    def setBoard(self, board):
+        self.board = board
+
+    ## Metodo que retorna o step atual (build ou deliberate)
+    def getStep(self):
+        return self.step
+
+    ## No modo headless não é possível construir o labirinto clicando
+    def drawToBuild(self):
+        pass
+
+    def draw(self):
+        pass
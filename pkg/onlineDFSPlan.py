@@ -3,9 +3,20 @@ from state import State
 import math
 
 class OnlineDFSPlan:
+    # ações na ordem usada para sortear; o bit i da máscara de ações não tentadas corresponde a actions[i]
+    actions = ["S", "L", "N", "O"]
+    allActions = 0b1111
+
+    movePos = {"N": (-1, 0),
+               "S": (1, 0),
+               "L": (0, 1),
+               "O": (0, -1)}
+
     def __init__(self, problem, startState, name="explorar"):    
         """
         Plano para explorar o mapa, implementado utilizando DFS-Online.
+        O estado de cada posição só é criado quando o agente passa por ela, então o plano começa em tempo constante
+        e usa memória proporcional às posições visitadas.
         @param problem: crenças do agente (onde irá ser salvo o mapa da exploração)
         @param startState: coordenada de início do robô
         @param name: nome do plano
@@ -14,14 +25,9 @@ class OnlineDFSPlan:
         self.initialState = startState
         self.currentState = startState
         self.prob = problem
-        self.actions = ["S", "L", "N", "O"]
 
-        self.untried = dict()  # mostra um array de ações ainda não tentadas no estado
-        self.unbacktracked = dict()  # mostra uma fila de estados que levaram ao estado s
-        for i in range(self.prob.maxRows):
-            for j in range(self.prob.maxColumns):
-                self.untried[(i, j)] = self.actions
-                self.unbacktracked[(i, j)] = []
+        self.untried = dict()  # máscara de 4 bits das ações ainda não tentadas no estado (ausente: todas)
+        self.unbacktracked = dict()  # mostra uma fila de estados que levaram ao estado s (ausente: vazia)
 
         self.result = {}  # mostra o estado resultado s' após executar ação a partir de s
 
@@ -52,27 +58,23 @@ class OnlineDFSPlan:
         return: tupla contendo a acao (direcao) e o estado futuro resultante da movimentacao """
 
         position = (self.currentState.row, self.currentState.col)
-        possibilities = self.untried[position].copy() # As possibilidades de movimentos são os movimentos que não tentei fazer ainda
-        movePos = {"N": (-1, 0),
-                   "S": (1, 0),
-                   "L": (0, 1),
-                   "O": (0, -1)}
+        untried = self.untried.get(position, self.allActions) # As possibilidades de movimentos são os movimentos que não tentei fazer ainda
 
-        if len(possibilities) > 0: # Se ainda tem algum movimento que não tentei nessa posição
+        if untried: # Se ainda tem algum movimento que não tentei nessa posição
+            possibilities = [i for i in range(len(self.actions)) if untried >> i & 1]
             rand = randint(0, len(possibilities)-1)
-            # rand = 0
-            movDirection = possibilities[rand] # Pega uma das possibilidades de movimento
+            movDirection = self.actions[possibilities[rand]] # Pega uma das possibilidades de movimento
 
-            possibilities.pop(rand) # Remove o movimento que escolhi dos movimentos não tentados
-            self.untried[position] = possibilities 
-            state = State(self.currentState.row + movePos[movDirection][0], # Atualiza o estado que eu espero ir
-                          self.currentState.col + movePos[movDirection][1])
+            self.untried[position] = untried & ~(1 << possibilities[rand]) # Remove o movimento que escolhi dos movimentos não tentados
+            state = State(self.currentState.row + self.movePos[movDirection][0], # Atualiza o estado que eu espero ir
+                          self.currentState.col + self.movePos[movDirection][1])
         else: # Se já fiz todos os movimentos dessa posição, olho a lista de backtrack e volto uma posição
-            if len(self.unbacktracked[position]) > 0:
-                backtrackState = self.unbacktracked[position].pop(0) # Pego o primeiro elemento da lista de backtrack
+            backtrack = self.unbacktracked.get(position)
+            if backtrack:
+                backtrackState = backtrack.pop(0) # Pego o primeiro elemento da lista de backtrack
                 state = State(backtrackState[0], backtrackState[1]) # Coordenada para onde quero ir
                 direction = (backtrackState[0] - position[0], backtrackState[1] - position[1])
-                movDirection = list(movePos.keys())[list(movePos.values()).index(direction)] # Direção pra que preciso ir para chegar na coordenada desejada
+                movDirection = list(self.movePos.keys())[list(self.movePos.values()).index(direction)] # Direção pra que preciso ir para chegar na coordenada desejada
             else: # Se não tem nenhum nó em unbacktracked, termina a execução
                 movDirection = "nop"
                 state = self.currentState
@@ -85,19 +87,19 @@ class OnlineDFSPlan:
         @return: tupla contendo a acao (direcao) e uma instância da classe State que representa a posição esperada após a execução
         """
 
-        ## Tenta encontrar um movimento possivel dentro do tabuleiro 
-        result = self.getNextPosition()
+        # Tenta encontrar um movimento possivel dentro do tabuleiro; se o movimento não é possível (parede conhecida ou
+        # fora do mapa), tenta outro. O número de tentativas é limitado pelas ações não tentadas e pelos estados de backtrack.
+        while True:
+            result = self.getNextPosition()
+            if self.isPossibleToMove(result[1]):
+                break
+
         currentPos = (self.currentState.row, self.currentState.col)
         nextPos = (result[1].row, result[1].col)
-
-        if self.isPossibleToMove(result[1]) and result[0] != 'nop': 
-            if (currentPos, result[0]) not in self.result.keys(): # Se eu ainda não sei o resultado de executar essa ação (result[0]) nessa posição (currentPos)
+        if result[0] != 'nop':
+            if (currentPos, result[0]) not in self.result: # Se eu ainda não sei o resultado de executar essa ação (result[0]) nessa posição (currentPos)
                 self.result[(currentPos, result[0])] = nextPos # Adiciona que o resultado de executar a ação (result[0]) na currentPos resulta ir para nextPos
-                self.unbacktracked[nextPos].insert(0, currentPos) # Adiciona a posição atual na frente da lista de unbacktracked da posição futura
-
-        # Se é um movimento que não é possível de ser feito, tenta encontrar outro movimento
-        if not self.isPossibleToMove(result[1]):
-            return self.chooseAction()
+                self.unbacktracked.setdefault(nextPos, []).insert(0, currentPos) # Adiciona a posição atual na frente da lista de unbacktracked da posição futura
 
         return result
 
@@ -105,7 +107,7 @@ class OnlineDFSPlan:
     def isThereWall(self, pos):
         """ Verifica se o agente já detectou que há uma parede na coordenada especificada
         @param pos: coordenada que se quer checar se há parede """
-        return self.prob.mazeBeliefs[pos[0]][pos[1]] == -2
+        return self.prob.mazeBeliefs.get(pos[0], pos[1]) == -2
 
     def isCoordinateValid(self, coord):
         """ Verifica se é uma coordenada dentro das fronteiras do mapa """
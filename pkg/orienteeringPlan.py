@@ -0,0 +1,254 @@
+import math
+
+from greedyPathPlan import GreedyPathPlan
+
+try:
+    import numpy as np
+except ImportError: # sem NumPy todos os casos usam a busca local
+    np = None
+
+
+class OrienteeringPlan(GreedyPathPlan):
+    def __init__(self, problem, startState, time, name="caminhoOrientacao", useDistanceFields=False, pathCache=None, pathMethod="astar",
+                 exactLimit=16):
+        """
+        Plano que trata o resgate como um problema de orientação (orienteering): escolher quais vítimas visitar, e em
+        que ordem, para maximizar a soma das gravidades saindo da base e voltando para ela dentro do tempo disponível
+        (em caso de empate, com o menor custo). O caminho é calculado uma vez, no início, como em GeneticPlan.
+        Com até exactLimit vítimas alcançáveis usa programação dinâmica sobre subconjuntos (máscaras de bits), que encontra
+        o tour ótimo; acima disso, constrói um tour guloso por inserção e o melhora com busca local (2-opt, Or-opt,
+        inserção e troca de vítimas).
+        @param problem: crenças do agente (contém o mapa criado durante a exploração)
+        @param startState: coordenada de início do robô
+        @param time: tempo que o plano tem para ser executado
+        @param name: nome do plano
+        @param useDistanceFields: calcula as distâncias com campos de distância do NumPy (ver distanceField)
+        @param pathCache: PathCache com as tabelas de caminhos já calculadas em execuções anteriores
+        @param pathMethod: algoritmo de busca de caminho ("astar" ou "jps", ver PathFinder)
+        @param exactLimit: número máximo de vítimas para usar a programação dinâmica (requer NumPy)
+        """
+        super().__init__(problem, startState, time, name, useDistanceFields, pathCache, pathMethod)
+        self.exactLimit = exactLimit
+
+        # só entram no problema as vítimas que têm caminho até a base (a tabela marca as sem caminho com custo 0 e caminho vazio)
+        basePos = (startState.row, startState.col)
+        self.candidates = [v for v in self.victimsPositions if self.subPathTable[basePos][v][0]]
+        self.gravities = [self.getGravity(v) for v in self.candidates]
+        self.costs = self.costMatrix(basePos)
+
+        self.solve()
+
+    def solve(self):
+        """ Escolhe o tour (posições das vítimas, em self.tour), o método usado ("exato" ou "busca local", em self.method)
+        e o custo previsto (self.expectedCost) """
+        if np is not None and len(self.candidates) <= self.exactLimit:
+            self.method = "exato"
+            tour = self.solveExact()
+        else:
+            self.method = "busca local"
+            tour = self.solveLocalSearch()
+        self.tour = [self.candidates[i] for i in tour]
+        self.expectedCost = self.tourCost(tour)
+
+    def costMatrix(self, basePos):
+        """ Custo entre cada par de posições: os índices 0..V-1 são as vítimas candidatas e o índice V é a base """
+        positions = self.candidates + [basePos]
+        return [[self.subPathTable[origin][destination][1] if origin != destination else 0 for destination in positions]
+                for origin in positions]
+
+    def tourCost(self, tour):
+        """ Custo de sair da base, visitar as vítimas do tour na ordem e voltar para a base """
+        base = len(self.candidates)
+        cost = 0
+        previous = base
+        for victim in tour:
+            cost += self.costs[previous][victim]
+            previous = victim
+        return cost + self.costs[previous][base]
+
+    def tourGravity(self, tour):
+        return sum(self.gravities[victim] for victim in tour)
+
+    def solveExact(self):
+        """ Programação dinâmica sobre subconjuntos: cost[mask, j] é o menor custo para sair da base, visitar exatamente
+        as vítimas de mask e terminar em j. Os subconjuntos são processados por número de vítimas, cada camada de uma vez
+        com o NumPy. O melhor tour é o de maior gravidade (e menor custo) entre os que conseguem voltar a tempo.
+        @return tour ótimo (lista de índices de candidates)"""
+        V = len(self.candidates)
+        if V == 0:
+            return []
+        base = V
+        C = np.array(self.costs, dtype=float)
+        full = 1 << V
+        masks = np.arange(full)
+        bits = (masks[:, None] >> np.arange(V)) & 1
+        counts = bits.sum(axis=1)
+
+        cost = np.full((full, V), np.inf)
+        for j in range(V):
+            cost[1 << j, j] = C[base, j]
+        # estados que não conseguem mais voltar para a base a tempo são descartados; se uma camada inteira for descartada,
+        # nenhum subconjunto maior cabe no tempo
+        cost[cost + C[:V, base] > self.time] = np.inf
+        for k in range(2, V + 1):
+            layer = masks[counts == k]
+            for j in range(V):
+                withJ = layer[bits[layer, j] == 1]
+                previous = withJ ^ (1 << j)
+                best = (cost[previous] + C[:V, j]).min(axis=1)
+                best[best + C[j, base] > self.time] = np.inf
+                cost[withJ, j] = best
+            if np.isinf(cost[layer]).all():
+                break
+
+        total = cost + C[:V, base]
+        gravity = bits @ np.array(self.gravities, dtype=float)
+        feasible = total <= self.time
+        if not feasible.any():
+            return []
+        # maior gravidade; entre as de mesma gravidade, menor custo total
+        bestGravity = np.where(feasible.any(axis=1), gravity, -1).max()
+        candidates = np.where(feasible & (gravity[:, None] == bestGravity), total, np.inf)
+        mask, last = np.unravel_index(np.argmin(candidates), candidates.shape)
+
+        # reconstrói o tour de trás para frente, procurando o predecessor que dá exatamente o custo guardado
+        tour = [int(last)]
+        mask = int(mask)
+        last = int(last)
+        while mask != (1 << last):
+            previousMask = mask ^ (1 << last)
+            for i in range(V):
+                if (previousMask >> i) & 1 and cost[previousMask, i] + C[i, last] == cost[mask, last]:
+                    tour.append(i)
+                    mask, last = previousMask, i
+                    break
+        tour.reverse()
+        return tour
+
+    def solveLocalSearch(self):
+        """ Tour guloso por inserção (melhor razão gravidade/custo extra) seguido de busca local até não haver melhora:
+        2-opt e Or-opt diminuem o custo do tour, inserção e troca de vítimas aumentam a gravidade salva.
+        @return tour (lista de índices de candidates)"""
+        tour = []
+        cost = self.tourCost(tour)
+        while True:
+            best = self.bestInsertion(tour, cost, range(len(self.candidates)), byRatio=True)
+            if best is None:
+                break
+            victim, position, delta = best
+            tour.insert(position, victim)
+            cost += delta
+
+        improved = True
+        while improved:
+            improved = self.twoOpt(tour) or self.orOpt(tour) or self.insertVictim(tour) or self.replaceVictim(tour) is not None
+        return tour
+
+    def insertionDelta(self, tour, victim, position):
+        """ Custo extra de inserir a vítima no tour antes do índice position """
+        base = len(self.candidates)
+        previous = tour[position-1] if position > 0 else base
+        following = tour[position] if position < len(tour) else base
+        return self.costs[previous][victim] + self.costs[victim][following] - self.costs[previous][following]
+
+    def bestInsertion(self, tour, cost, victims, byRatio=False):
+        """ Melhor inserção possível dentro do tempo de uma das vítimas (que ainda não estão no tour)
+        @param byRatio: escolhe pela razão gravidade/custo extra (senão, pela maior gravidade e menor custo extra)
+        @return tupla (vítima, posição, custo extra) ou None se nenhuma couber"""
+        inTour = set(tour)
+        best = None
+        bestKey = None
+        for victim in victims:
+            if victim in inTour:
+                continue
+            for position in range(len(tour) + 1):
+                delta = self.insertionDelta(tour, victim, position)
+                if cost + delta > self.time:
+                    continue
+                if byRatio:
+                    key = (self.gravities[victim] / delta if delta > 0 else math.inf, -delta)
+                else:
+                    key = (self.gravities[victim], -delta)
+                if bestKey is None or key > bestKey:
+                    best = (victim, position, delta)
+                    bestKey = key
+        return best
+
+    def twoOpt(self, tour):
+        """ Inverte um trecho do tour se isso diminuir o custo (os custos são simétricos) """
+        base = len(self.candidates)
+        C = self.costs
+        for i in range(len(tour) - 1):
+            previous = tour[i-1] if i > 0 else base
+            for j in range(i + 1, len(tour)):
+                following = tour[j+1] if j + 1 < len(tour) else base
+                delta = C[previous][tour[j]] + C[tour[i]][following] - C[previous][tour[i]] - C[tour[j]][following]
+                if delta < 0:
+                    tour[i:j+1] = reversed(tour[i:j+1])
+                    return True
+        return False
+
+    def orOpt(self, tour):
+        """ Move um trecho de 1 a 3 vítimas para outra posição do tour se isso diminuir o custo """
+        cost = self.tourCost(tour)
+        for length in (1, 2, 3):
+            for i in range(len(tour) - length + 1):
+                segment = tour[i:i+length]
+                rest = tour[:i] + tour[i+length:]
+                for position in range(len(rest) + 1):
+                    if position == i:
+                        continue
+                    candidate = rest[:position] + segment + rest[position:]
+                    if self.tourCost(candidate) < cost:
+                        tour[:] = candidate
+                        return True
+        return False
+
+    def insertVictim(self, tour, available=None):
+        """ Insere mais uma vítima no tour, se alguma couber no tempo
+        @param available: vítimas que podem entrar no tour (padrão: todas as que não estão nele)"""
+        if available is None:
+            available = range(len(self.candidates))
+        best = self.bestInsertion(tour, self.tourCost(tour), available)
+        if best is None:
+            return False
+        victim, position, delta = best
+        tour.insert(position, victim)
+        return True
+
+    def replaceVictim(self, tour, available=None):
+        """ Troca uma vítima do tour por outra de fora com gravidade maior (ou igual, se o tour ficar mais barato)
+        @param available: vítimas que podem entrar no tour (padrão: todas as que não estão nele)
+        @return a vítima que saiu do tour ou None se não houve troca"""
+        cost = self.tourCost(tour)
+        if available is None:
+            available = range(len(self.candidates))
+        outside = [v for v in available if v not in tour]
+        for i, victim in enumerate(tour):
+            rest = tour[:i] + tour[i+1:]
+            restCost = self.tourCost(rest)
+            better = [v for v in outside if self.gravities[v] >= self.gravities[victim]]
+            best = self.bestInsertion(rest, restCost, better)
+            if best is None:
+                continue
+            other, position, delta = best
+            if (self.gravities[other], -(restCost + delta)) > (self.gravities[victim], -cost):
+                rest.insert(position, other)
+                tour[:] = rest
+                return victim
+        return None
+
+    def chooseNextGoal(self):
+        """ Próxima vítima do tour ainda não socorrida; depois da última, volta para a base """
+        pos = (self.currentState.row, self.currentState.col)
+        basePos = (self.startCoordinate.row, self.startCoordinate.col)
+        best_path = self.subPathTable[pos][basePos][0]
+        for victim in self.tour:
+            if victim not in self.savedVictims:
+                best_path = self.subPathTable[pos][victim][0]
+                break
+        self.path = list(best_path) # cópia: o caminho é consumido durante a execução
+
+    def printMetrics(self, totalCost, victimsVitalSignals, numVictims):
+        super().printMetrics(totalCost, victimsVitalSignals, numVictims)
+        print("Tour calculado por: ", self.method, " (custo previsto: ", self.expectedCost, ")")
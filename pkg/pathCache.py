@@ -0,0 +1,113 @@
+import os
+import pickle
+import hashlib
+from array import array
+
+import cardinal
+
+
+class PathCache:
+    def __init__(self, directory=".path_cache", maxBytes=64 * 1024 * 1024):
+        """
+        Cache em disco da tabela de caminhos entre a base e as vítimas (possibleSubPaths dos planos de resgate).
+        Cada tabela fica em um arquivo cujo nome é o hash do mapa de crenças, da posição da base e das vítimas;
+        quando o tamanho total passa de maxBytes, os arquivos usados há mais tempo são apagados.
+        @param directory: pasta onde os arquivos do cache são salvos
+        @param maxBytes: tamanho máximo do cache em bytes
+        """
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def makeKey(self, problem, basePos, positions):
+        """ Hash que identifica a tabela: mapa de crenças, base e conjunto de vítimas
+        @param problem: crenças do agente
+        @param basePos: coordenada da base
+        @param positions: coordenadas das vítimas"""
+        digest = hashlib.sha256()
+        digest.update(array('i', [problem.maxRows, problem.maxColumns, basePos[0], basePos[1]]).tobytes())
+        digest.update(problem.mazeBeliefs.tobytes())
+        for pos in sorted(positions):
+            digest.update(array('i', pos).tobytes())
+        return digest.hexdigest()
+
+    def fileName(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    # Índice da direção (ver cardinal.action) de cada variação (linha, coluna)
+    directions = {(cardinal.rowIncrement[i], cardinal.colIncrement[i]): i for i in range(len(cardinal.action))}
+
+    def encodePath(self, start, path):
+        """ Codifica o caminho como a sequência de direções (índices de cardinal.action), um byte por passo """
+        moves = bytearray()
+        previous = start
+        for pos in path:
+            moves.append(self.directions[(pos[0] - previous[0], pos[1] - previous[1])])
+            previous = pos
+        return bytes(moves)
+
+    def decodePath(self, start, moves):
+        """ Reconstrói o caminho (sem start) a partir da sequência de direções """
+        path = []
+        row, col = start
+        for move in moves:
+            row += cardinal.rowIncrement[move]
+            col += cardinal.colIncrement[move]
+            path.append((row, col))
+        return path
+
+    def load(self, key):
+        """ Retorna a tabela salva com a chave ou None se ela não estiver no cache """
+        name = self.fileName(key)
+        try:
+            with open(name, "rb") as arq:
+                positions, entries = pickle.load(arq)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        os.utime(name) # marca como usado recentemente
+
+        table = dict()
+        for pos in positions:
+            table[pos] = dict()
+        for (i, j), (moves, cost) in entries.items():
+            table[positions[i]][positions[j]] = (self.decodePath(positions[i], moves), cost)
+        self.hits += 1
+        return table
+
+    def store(self, key, table):
+        """ Salva a tabela no cache (origem -> destino -> (caminho, custo)) e remove arquivos antigos se necessário """
+        positions = list(table.keys())
+        indexes = {pos: i for i, pos in enumerate(positions)}
+        entries = dict()
+        for origin in table:
+            for destination, (path, cost) in table[origin].items():
+                entries[(indexes[origin], indexes[destination])] = (self.encodePath(origin, path), cost)
+
+        # grava em um arquivo temporário e renomeia, para que outros processos nunca leiam um arquivo pela metade
+        name = self.fileName(key)
+        temporary = name + "." + str(os.getpid()) + ".tmp"
+        with open(temporary, "wb") as arq:
+            pickle.dump((positions, entries), arq, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, name)
+        self.evict()
+
+    def evict(self):
+        """ Apaga os arquivos usados há mais tempo até o cache caber em maxBytes """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for mtime, size, path in files)
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,376 @@
+from heapq import heappush, heappop
+import math
+
+
+class PathFinder:
+    def __init__(self, problem, method="astar"):
+        """
+        Busca de caminhos sobre o mapa de crenças do agente (grid 8-conectado).
+        Um movimento ortogonal custa 1 e um diagonal custa 1.5; só é possível andar por locais já explorados
+        (sem parede) e, na diagonal, não é possível cortar o canto de uma parede ou de um local desconhecido.
+        @param problem: crenças do agente (contém o mapa criado durante a exploração)
+        @param method: algoritmo usado por findPath: "astar" (A*) ou "jps" (Jump Point Search)
+        """
+        self.prob = problem
+        self.method = method
+
+        # número de nós expandidos (retirados da fronteira) desde a criação do objeto
+        self.expansions = 0
+
+    # Variação das coordenadas para chegar em cada um dos 8 vizinhos (vizinho = atual - offset)
+    offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+    def isCoordinateValid(self, coord):
+        """ Verifica se é uma coordenada dentro das fronteiras do mapa """
+        return coord[0] >= 0 and coord[1] >= 0 and coord[0] < self.prob.maxRows and coord[1] < self.prob.maxColumns
+
+    # Se for um local com parede o valor no mapa é -2, se for um local não explorado o valor é -1
+    def isPossibleToMove(self, pos):
+        """ Verifica se o agente pode se mover para a posição especificada. Para isso, verifica se há paredes nessa
+        coordenada ou se ela é um local desconheido. Caso não seja um desses casos, é possível mover até a posição.
+        @param pos: coordenada que se quer checar se é possível mover """
+        return self.isCoordinateValid(pos) and self.prob.mazeBeliefs.get(pos[0], pos[1]) >= 0
+
+    def d(self, current, offset, neighbor):
+        """ Custo para ir de um ponto até seu vizinho.
+        Verifica se a posição para onde está tentando ir é uma parede ou um local desconhecido. Se for, é impossível ir até o vizinho (inf)
+        Se for um local já explorado, se a ação não for de andar na diagonal, retorna o custo da ação.
+        Se for uma ação para andar na diagonal, verifica se há uma parede ou um local não explorado no caminho que possam impossibilitar o movimento.
+        Se tiver algo impossibilitando, retorna inf, senão, retorna o custo da ação
+        @param current: nó atual
+        @param offset: qual é a variação das coordenadas do nó atual para chegar até o vizinho
+        @param neighbor: nó vizinho"""
+        if not self.isPossibleToMove(neighbor):
+            return math.inf
+
+        if (offset[0] == 0 or offset[1] == 0): # Se não tiver parede no lugar e não estou indo na diagonal o custo é 1
+            return 1
+
+        # Se estou indo pra diagonal, não é possível mover se tiver alguma parede no caminho ou se eu não explorei o local e não sei se tem parede ou não
+        if not (self.isPossibleToMove((current[0] - offset[0], current[1])) and self.isPossibleToMove((current[0], current[1] - offset[1]))):
+            return math.inf
+        return 1.5
+
+    # Heurística utilizada: distância octil com custo 1.5 na diagonal - admissível e consistente,
+    # e mais próxima do custo real do que a distância pitagórica
+    def heuristic(self, pos, end):
+        """Estima o custo para ir de pos até end em um mapa sem paredes
+        @param pos: coordenada atual
+        @param end: coordenada objetivo"""
+        dRow = abs(end[0] - pos[0])
+        dCol = abs(end[1] - pos[1])
+        return max(dRow, dCol) + 0.5 * min(dRow, dCol)
+
+    def reconstructPath(self, end, cameFrom):
+        """ Cria o caminho do robô a partir da informação de origem encontrada de cada posição, começando do final.
+        O retorno é um vetor ordenado por ordem de visita dos nós para sair do nó inicial até o final (sem o nó inicial)
+        @param end: coordenada final do caminho
+        @param cameFrom: dicionário com a coordenada de onde se chegou em cada nó"""
+        path = []
+        current = end
+        while current in cameFrom:
+            path.append(current)
+            current = cameFrom[current]
+        path.reverse()
+        return path
+
+    def findPath(self, start, end):
+        """ Calcula o caminho de start até end (sem start) com o algoritmo escolhido na criação do objeto """
+        if self.method == "jps":
+            return self.jumpPointSearch(start, end)
+        return self.aStar(start, end)
+
+    def aStar(self, start, end):
+        """ Calcula o caminho de start até end com o algoritmo A*.
+        A fronteira é um min-heap (entradas repetidas de um nó são descartadas ao sair do heap), g(n) só é
+        guardado para os nós alcançados e os nós já expandidos ficam em um conjunto fechado.
+        @param start: coordenada (linha, coluna) de início
+        @param end: coordenada (linha, coluna) objetivo
+        @return vetor com as coordenadas a serem percorridas (sem start); vazio se não houver caminho"""
+        start = tuple(start)
+        end = tuple(end)
+        gScore = {start: 0} # g(n): custo para chegar ao nó n
+        cameFrom = dict() # Armazena de qual coordenada o robô chegou para chegar na outra
+        closedSet = set()
+        openHeap = [(self.heuristic(start, end), 0, start)]
+
+        while openHeap: # Enquanto houverem nós na fronteira
+            f, h, current = heappop(openHeap) # Pega o nó da fronteira com menor f(n)
+            if current in closedSet: # Entrada antiga de um nó que já foi expandido com um custo menor
+                continue
+
+            if current == end: # Verifica se é a posição objetivo. Se for, retorna o caminho até o objetivo
+                return self.reconstructPath(current, cameFrom)
+
+            closedSet.add(current)
+            self.expansions += 1
+            currentG = gScore[current]
+
+            for offset in self.offsets: # Para cada vizinho do nó
+                neighbor = (current[0] - offset[0], current[1] - offset[1])
+                if neighbor in closedSet:
+                    continue
+                tentative_gScore = currentG + self.d(current, offset, neighbor)
+                if tentative_gScore < gScore.get(neighbor, math.inf): # Verifica se é possível melhorar o g(n) do vizinho
+                    cameFrom[neighbor] = current # Atualiza o nó de origem para ir até o viziho
+                    gScore[neighbor] = tentative_gScore # Atualiza g(n)
+                    h = self.heuristic(neighbor, end)
+                    heappush(openHeap, (tentative_gScore + h, h, neighbor)) # Adiciona o nó na fronteira
+        return [] #Não há caminho
+
+    def isWalkable(self, row, col):
+        """ Mesmo teste de isPossibleToMove, recebendo linha e coluna separadas """
+        return 0 <= row < self.prob.maxRows and 0 <= col < self.prob.maxColumns and self.prob.mazeBeliefs.get(row, col) >= 0
+
+    def jumpStraight(self, row, col, dRow, dCol, end):
+        """ Avança em linha reta (movimento ortogonal) a partir de (row, col) até encontrar o objetivo, um ponto de
+        salto (posição com vizinho forçado) ou um bloqueio.
+        @return o ponto de salto encontrado ou None"""
+        walkable = self.isWalkable
+        while walkable(row, col):
+            if (row, col) == end:
+                return (row, col)
+            if dRow != 0:
+                if (walkable(row, col-1) and not walkable(row-dRow, col-1)) or (walkable(row, col+1) and not walkable(row-dRow, col+1)):
+                    return (row, col)
+            else:
+                if (walkable(row-1, col) and not walkable(row-1, col-dCol)) or (walkable(row+1, col) and not walkable(row+1, col-dCol)):
+                    return (row, col)
+            row += dRow
+            col += dCol
+        return None
+
+    def jump(self, row, col, dRow, dCol, end):
+        """ Avança na direção (dRow, dCol) a partir de (row, col), que acabou de ser alcançado, e retorna o próximo
+        ponto de salto ou None. Na diagonal, a posição é ponto de salto quando um dos avanços ortogonais a partir
+        dela encontra algo; só continua na diagonal se as duas posições laterais forem livres (sem cortar cantos)."""
+        if dRow == 0 or dCol == 0:
+            return self.jumpStraight(row, col, dRow, dCol, end)
+
+        walkable = self.isWalkable
+        while walkable(row, col):
+            if (row, col) == end:
+                return (row, col)
+            if self.jumpStraight(row + dRow, col, dRow, 0, end) or self.jumpStraight(row, col + dCol, 0, dCol, end):
+                return (row, col)
+            if not (walkable(row + dRow, col) and walkable(row, col + dCol)):
+                return None
+            row += dRow
+            col += dCol
+        return None
+
+    def prunedNeighbors(self, current, parent):
+        """ Vizinhos que precisam ser considerados a partir de current, dado o nó de onde se chegou nele
+        (regras de poda do Jump Point Search para movimentos diagonais sem cortar cantos) """
+        row, col = current
+        walkable = self.isWalkable
+        if parent is None:
+            return [(row - offset[0], col - offset[1]) for offset in self.offsets
+                    if self.d(current, offset, (row - offset[0], col - offset[1])) != math.inf]
+
+        dRow = (row > parent[0]) - (row < parent[0])
+        dCol = (col > parent[1]) - (col < parent[1])
+        neighbors = []
+        if dRow != 0 and dCol != 0:
+            rowFree = walkable(row + dRow, col)
+            colFree = walkable(row, col + dCol)
+            if rowFree:
+                neighbors.append((row + dRow, col))
+            if colFree:
+                neighbors.append((row, col + dCol))
+            if rowFree and colFree:
+                neighbors.append((row + dRow, col + dCol))
+        elif dRow != 0:
+            nextFree = walkable(row + dRow, col)
+            leftFree = walkable(row, col - 1)
+            rightFree = walkable(row, col + 1)
+            if nextFree:
+                neighbors.append((row + dRow, col))
+                if leftFree:
+                    neighbors.append((row + dRow, col - 1))
+                if rightFree:
+                    neighbors.append((row + dRow, col + 1))
+            if leftFree:
+                neighbors.append((row, col - 1))
+            if rightFree:
+                neighbors.append((row, col + 1))
+        else:
+            nextFree = walkable(row, col + dCol)
+            upFree = walkable(row - 1, col)
+            downFree = walkable(row + 1, col)
+            if nextFree:
+                neighbors.append((row, col + dCol))
+                if upFree:
+                    neighbors.append((row - 1, col + dCol))
+                if downFree:
+                    neighbors.append((row + 1, col + dCol))
+            if upFree:
+                neighbors.append((row - 1, col))
+            if downFree:
+                neighbors.append((row + 1, col))
+        return neighbors
+
+    def jumpPointSearch(self, start, end):
+        """ Calcula o caminho de start até end com Jump Point Search: um A* que, em vez de expandir todos os
+        vizinhos, salta em linha reta até as posições onde o caminho ótimo pode mudar de direção.
+        Tem as mesmas regras de movimento de d() e retorna um caminho de mesmo custo que aStar.
+        @param start: coordenada (linha, coluna) de início
+        @param end: coordenada (linha, coluna) objetivo
+        @return vetor com as coordenadas a serem percorridas (sem start); vazio se não houver caminho"""
+        start = tuple(start)
+        end = tuple(end)
+        gScore = {start: 0}
+        cameFrom = dict()
+        closedSet = set()
+        openHeap = [(self.heuristic(start, end), 0, start)]
+
+        while openHeap:
+            f, h, current = heappop(openHeap)
+            if current in closedSet:
+                continue
+
+            if current == end:
+                return self.expandJumpPath(self.reconstructPath(current, cameFrom), start)
+
+            closedSet.add(current)
+            self.expansions += 1
+            currentG = gScore[current]
+
+            for neighbor in self.prunedNeighbors(current, cameFrom.get(current)):
+                jumpPoint = self.jump(neighbor[0], neighbor[1], neighbor[0] - current[0], neighbor[1] - current[1], end)
+                if jumpPoint is None or jumpPoint in closedSet:
+                    continue
+                steps = max(abs(jumpPoint[0] - current[0]), abs(jumpPoint[1] - current[1]))
+                diagonal = jumpPoint[0] != current[0] and jumpPoint[1] != current[1]
+                tentative_gScore = currentG + steps * (1.5 if diagonal else 1)
+                if tentative_gScore < gScore.get(jumpPoint, math.inf):
+                    cameFrom[jumpPoint] = current
+                    gScore[jumpPoint] = tentative_gScore
+                    h = self.heuristic(jumpPoint, end)
+                    heappush(openHeap, (tentative_gScore + h, h, jumpPoint))
+        return []
+
+    def expandJumpPath(self, jumpPoints, start):
+        """ Transforma a sequência de pontos de salto (sem start) no caminho completo, posição por posição """
+        path = []
+        previous = start
+        for point in jumpPoints:
+            dRow = (point[0] > previous[0]) - (point[0] < previous[0])
+            dCol = (point[1] > previous[1]) - (point[1] < previous[1])
+            row, col = previous
+            while (row, col) != point:
+                row += dRow
+                col += dCol
+                path.append((row, col))
+            previous = point
+        return path
+
+    def dijkstra(self, start, targets):
+        """ Busca de custo uniforme a partir de start que para quando todos os alvos foram alcançados.
+        Uma única expansão fornece o caminho de start até cada um dos alvos (pela árvore de predecessores).
+        @param start: coordenada (linha, coluna) de início
+        @param targets: coordenadas que se quer alcançar
+        @return dicionário alvo -> (caminho sem start, custo); alvos inalcançáveis não aparecem no dicionário"""
+        start = tuple(start)
+        remaining = set(targets)
+        found = dict()
+        gScore = {start: 0}
+        cameFrom = dict()
+        closedSet = set()
+        openHeap = [(0, start)]
+
+        while openHeap and remaining:
+            currentG, current = heappop(openHeap)
+            if current in closedSet:
+                continue
+            closedSet.add(current)
+            self.expansions += 1
+
+            if current in remaining: # Chegou em um dos alvos: seu custo já é o mínimo
+                remaining.remove(current)
+                found[current] = (self.reconstructPath(current, cameFrom), currentG)
+
+            for offset in self.offsets:
+                neighbor = (current[0] - offset[0], current[1] - offset[1])
+                if neighbor in closedSet:
+                    continue
+                tentative_gScore = currentG + self.d(current, offset, neighbor)
+                if tentative_gScore < gScore.get(neighbor, math.inf):
+                    cameFrom[neighbor] = current
+                    gScore[neighbor] = tentative_gScore
+                    heappush(openHeap, (tentative_gScore, neighbor))
+        return found
+
+    def pathsFrom(self, start, targets):
+        """ Caminhos de start até cada um dos alvos: com A* usa uma única busca de custo uniforme (dijkstra);
+        com Jump Point Search faz uma busca por alvo.
+        @return dicionário alvo -> (caminho sem start, custo); alvos inalcançáveis não aparecem no dicionário"""
+        if self.method != "jps":
+            return self.dijkstra(start, targets)
+        found = dict()
+        for target in targets:
+            if target == tuple(start):
+                found[target] = ([], 0)
+                continue
+            path = self.jumpPointSearch(start, target)
+            if len(path) > 0:
+                found[target] = (path, self.pathCost(start, path))
+        return found
+
+    def pathCost(self, start, path):
+        """ Custo de percorrer o caminho (sem start) a partir de start """
+        cost = 0
+        previous = start
+        for pos in path:
+            cost += 1 if (pos[0] == previous[0] or pos[1] == previous[1]) else 1.5
+            previous = pos
+        return cost
+
+    def reversePath(self, start, path):
+        """ Dado o caminho de start até o fim (sem start), retorna o caminho do fim até start (sem o fim).
+        Os movimentos são simétricos, então o custo é o mesmo nos dois sentidos. """
+        if len(path) == 0:
+            return []
+        reversed_path = [start] + path[:-1]
+        reversed_path.reverse()
+        return reversed_path
+
+    def subPathTable(self, basePos, positions, useDistanceFields=False, cache=None):
+        """ Calcula o caminho e o custo entre cada par de posições de interesse (a base e as vítimas).
+        Faz uma busca de custo uniforme por posição, até as posições que ainda não têm caminho calculado; o
+        caminho no sentido contrário é obtido invertendo o caminho encontrado.
+        Pares sem caminho ficam com caminho vazio e custo 0.
+        @param basePos: coordenada da base
+        @param positions: coordenadas das vítimas
+        @param useDistanceFields: se True, usa os campos de distância vetorizados (ver distanceField, requer NumPy),
+        mais rápidos em mapas grandes
+        @param cache: PathCache onde a tabela é procurada antes de ser calculada (e salva depois)
+        @return dicionário origem -> destino -> (caminho sem a origem, custo)"""
+        if cache is not None:
+            key = cache.makeKey(self.prob, basePos, positions)
+            table = cache.load(key)
+            if table is None:
+                table = self.subPathTable(basePos, positions, useDistanceFields)
+                cache.store(key, table)
+            return table
+
+        if useDistanceFields:
+            import distanceField
+            return distanceField.subPathTable(self.prob.mazeBeliefs, basePos, positions)
+
+        table = dict()
+        table[basePos] = dict()
+        table[basePos][basePos] = ([], 0)
+        for pos in positions:
+            table[pos] = dict()
+
+        pending = list(positions)
+        for pos in positions:
+            pending.remove(pos)
+            targets = pending + [basePos]
+            found = self.pathsFrom(pos, targets)
+            for other in targets:
+                path, cost = found.get(other, ([], 0))
+                table[pos][other] = (path, cost)
+                table[other][pos] = (self.reversePath(pos, path), cost)
+        return table
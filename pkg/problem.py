@@ -1,5 +1,8 @@
+import copy
+
 from maze import Maze
 from state import State
+from beliefGrid import BeliefGrid
 from cardinal import *
 
 
@@ -10,7 +13,7 @@ class Problem:
     @param goalState: State com as coordenadas do objetivo (Não utilizado)
     @param maxRows: Número de linhas no mapa
     @param maxColumns: Número de colunas no mapa
-    @param mazeBeliefs: matriz de tamanho maxRows*maxColumns, percepções do agente sobre o labirinto
+    @param mazeBeliefs: matriz (BeliefGrid) de tamanho maxRows*maxColumns, percepções do agente sobre o labirinto
     # -1 são locais não explorados, 0 são locais explorados, -2 é parede, número maior que 0 é vítima (id da vítima)
     """
     def __init__(self, maxRows, maxColumns):
@@ -18,8 +21,14 @@ class Problem:
         self.goalState = State(0,0)
         self.maxRows = maxRows
         self.maxColumns = maxColumns
-        self.mazeBeliefs = [[-1 for j in range(maxColumns)] for i in range(maxRows)]
+        self.mazeBeliefs = BeliefGrid(maxRows, maxColumns, -1)
         self.victimsVitalSignals = []
+        # índices das vítimas encontradas, atualizados junto com o mapa: posição (linha, coluna) -> id da vítima
+        # e id da vítima -> sinais vitais
+        self.victims = dict()
+        self.vitalSignalsById = dict()
+        # objetos avisados quando o mapa de crenças muda (ver addObserver)
+        self.observers = []
 
     def defBasePosition(self, row, col):
         """Define o estado inicial.
@@ -28,24 +37,66 @@ class Problem:
         self.basePosition.row = row
         self.basePosition.col = col
 
+    def addObserver(self, observer):
+        """Registra um objeto que mantém alguma estrutura derivada do mapa (ex.: BaseCostField).
+        Ele é avisado por cellChanged(row, col, oldValue, newValue) quando uma posição muda
+        e por mazeChanged() quando o mapa inteiro é substituído.
+        @param observer: objeto a ser avisado"""
+        self.observers.append(observer)
+
+    def snapshot(self):
+        """Cópia das crenças no estado atual, para o código que roda fora do ciclo do agente (ex.: a thread do algoritmo
+        genético em AnytimeRescuePlan): alterações feitas depois em uma das cópias não aparecem na outra.
+        O mapa só é copiado quando uma das duas for alterada (ver BeliefGrid.snapshot); a cópia não tem observadores."""
+        clone = copy.copy(self)
+        clone.basePosition = State(self.basePosition.row, self.basePosition.col)
+        clone.goalState = State(self.goalState.row, self.goalState.col)
+        clone.mazeBeliefs = self.mazeBeliefs.snapshot()
+        clone.victimsVitalSignals = list(self.victimsVitalSignals)
+        clone.victims = dict(self.victims)
+        clone.vitalSignalsById = dict(self.vitalSignalsById)
+        clone.observers = []
+        return clone
+
     def setMaze(self, maze):
+        """Substitui o mapa de crenças
+        @param maze: BeliefGrid ou lista de listas com os valores de cada posição"""
+        if not isinstance(maze, BeliefGrid):
+            maze = BeliefGrid.fromRows(maze)
         self.mazeBeliefs = maze
+        self.victims = {pos: maze.get(pos[0], pos[1]) for pos in maze.positionsWhere(lambda value: value > 0)}
+        for observer in self.observers:
+            observer.mazeChanged()
 
     def updateMazePosition(self, coord, value):
         """Atualiza a posição do mapa com o valor passado
         @param coord: state com row e col do mapa que se quer atualizar
         @param value: valor que deseja-se colocar nessa posição do mapa"""
-        self.mazeBeliefs[coord.row][coord.col] = value
+        oldValue = self.mazeBeliefs.get(coord.row, coord.col)
+        self.mazeBeliefs.set(coord.row, coord.col, value)
+        if oldValue > 0:
+            del self.victims[(coord.row, coord.col)]
+        if value > 0:
+            self.victims[(coord.row, coord.col)] = value
+        if oldValue != value:
+            for observer in self.observers:
+                observer.cellChanged(coord.row, coord.col, oldValue, value)
 
     def isVictimInPosition(self, coord):
         """Retorna 1 se a há uma vítima na coordenada e 0 se não há
         @param coord: state com row e col do mapa que se quer verificar se contém vítima"""
-        return self.mazeBeliefs[coord.row][coord.col] > 0
+        return self.mazeBeliefs.get(coord.row, coord.col) > 0
 
     def saveVitalSignals(self, vitalSignals):
-        """Retorna 1 se a há uma vítima na coordenada e 0 se não há
-        @param coord: state com row e col do mapa que se quer verificar se contém vítima"""
+        """Salva os sinais vitais lidos de uma vítima
+        @param vitalSignals: lista de sinais vitais, o primeiro valor é o id da vítima"""
         self.victimsVitalSignals.append(vitalSignals)
+        self.vitalSignalsById[int(vitalSignals[0])] = vitalSignals
+
+    def getVitalSignals(self, victimId):
+        """Retorna os sinais vitais salvos da vítima ou False se eles não foram lidos
+        @param victimId: id da vítima"""
+        return self.vitalSignalsById.get(victimId, False)
 
     def defGoalState(self, row, col):
         """Define o estado objetivo.
@@ -80,20 +131,14 @@ class Problem:
 
     """Função utilizada para debug, printa as posições das paredes encontradas pelo robô"""
     def printWalls(self):
-        walls = []
-        for i in range(self.maxRows):
-            for j in range(self.maxColumns):
-                if(self.mazeBeliefs[i][j] == -2): walls.append([i, j])
+        walls = [[i, j] for i, j in self.mazeBeliefs.positionsWithValue(-2)]
         
         print("\nPosicoes com paredes: \n", walls, "\n")
 
 
     """Função utilizada para debug, printa as posições exploradas pelo robô"""
     def printExplored(self):
-        explored = []
-        for i in range(self.maxRows):
-            for j in range(self.maxColumns):
-                if(self.mazeBeliefs[i][j] == 0): explored.append([i, j])
+        explored = [[i, j] for i, j in self.mazeBeliefs.positionsWithValue(0)]
         
         print("\nPosicoes exploradas: \n", explored, "\n")
 
@@ -108,8 +153,12 @@ class Problem:
 
     """Retorna um vetor com as vítimas encontradas pelo robô"""
     def getVictims(self):
-        victims = []
-        for i in range(self.maxRows):
-            for j in range(self.maxColumns):
-                if(self.mazeBeliefs[i][j] > 0): victims.append([i, j])
-        return victims    
+        return [[i, j] for i, j in self.getVictimsPositions()]
+
+    """Retorna as posições (linha, coluna) das vítimas encontradas, na ordem das linhas do mapa"""
+    def getVictimsPositions(self):
+        return sorted(self.victims)
+
+    """Retorna o número de vítimas encontradas"""
+    def getNumberOfFoundVictims(self):
+        return len(self.victims)    
@@ -0,0 +1,60 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Instrumentação opcional dos agentes: tempo gasto em cada fase do ciclo de deliberação e na construção dos planos,
+    e contadores (ex.: nós expandidos pelo A*, avaliações do algoritmo genético).
+    Os tempos de cada fase ficam em um histograma em memória (faixas de potências de 2 em microssegundos), que pode ser
+    salvo em JSON no fim da execução (ver dump). Quando a instrumentação não é usada, os agentes recebem um NullProfiler."""
+    def __init__(self):
+        # nome da fase -> {"count", "total", "min", "max", "histogram": {limite superior em us -> número de medições}}
+        self.phases = dict()
+        # nome do contador -> valor acumulado
+        self.counters = dict()
+
+    @contextmanager
+    def phase(self, name):
+        """ Mede o tempo do bloco with e registra na fase name """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """ Registra uma medição (em segundos) da fase name """
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = {"count": 0, "total": 0.0, "min": math.inf, "max": 0.0, "histogram": dict()}
+            self.phases[name] = stats
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["min"] = min(stats["min"], seconds)
+        stats["max"] = max(stats["max"], seconds)
+        micro = seconds * 1e6
+        limit = 1 if micro <= 1 else 2 ** math.ceil(math.log2(micro))
+        stats["histogram"][limit] = stats["histogram"].get(limit, 0) + 1
+
+    def count(self, name, value=1):
+        """ Soma value ao contador name """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def toDict(self):
+        """ Tempos (em segundos) e contadores em um dicionário que pode ser salvo em JSON """
+        phases = dict()
+        for name, stats in self.phases.items():
+            phases[name] = {"count": stats["count"],
+                            "total": stats["total"],
+                            "mean": stats["total"] / stats["count"],
+                            "min": stats["min"],
+                            "max": stats["max"],
+                            "histogram_us": {str(limit): n for limit, n in sorted(stats["histogram"].items())}}
+        return {"phases": phases, "counters": dict(self.counters)}
+
+    def dump(self, path):
+        """ Salva os tempos e contadores em um arquivo JSON """
+        with open(path, "w") as arq:
+            json.dump(self.toDict(), arq, indent=2)
@@ -0,0 +1,92 @@
+import copy
+
+from orienteeringPlan import OrienteeringPlan
+
+
+class RescueAllocation(OrienteeringPlan):
+    def __init__(self, problem, startState, time, rescuers, name="caminhoEquipe", useDistanceFields=False, pathCache=None, pathMethod="astar"):
+        """
+        Divide as vítimas encontradas entre vários agentes de resgate, todos saindo da base com o mesmo tempo, e escolhe
+        o tour de cada um (problema de orientação com vários tours). Usa a mesma tabela de caminhos e a mesma matriz de
+        custos de OrienteeringPlan:
+        - leilão sequencial: a cada rodada, cada agente dá o seu lance pela vítima que ele consegue inserir no seu tour
+          com a melhor razão gravidade/custo extra, e o maior lance leva a vítima; termina quando nenhuma vítima cabe;
+        - busca local: 2-opt e Or-opt em cada tour, inserção de vítimas que não ficaram com ninguém e troca de uma vítima
+          de um tour por outra de fora com gravidade maior, até não haver melhora.
+        O plano de cada agente (ver planFor) segue o seu tour como OrienteeringPlan.
+        @param problem: crenças do agente (contém o mapa criado durante a exploração)
+        @param startState: coordenada de início dos agentes (a base)
+        @param time: tempo de cada agente para o resgate
+        @param rescuers: número de agentes de resgate
+        @param name: nome do plano
+        @param useDistanceFields: calcula as distâncias com campos de distância do NumPy (ver distanceField)
+        @param pathCache: PathCache com as tabelas de caminhos já calculadas em execuções anteriores
+        @param pathMethod: algoritmo de busca de caminho ("astar" ou "jps", ver PathFinder)
+        """
+        self.rescuers = rescuers
+        super().__init__(problem, startState, time, name, useDistanceFields, pathCache, pathMethod)
+
+    def solve(self):
+        """ Escolhe os tours (posições das vítimas, em self.tours) e o custo previsto de cada um (self.expectedCosts) """
+        self.method = "leilão e busca local"
+        tours = self.auction()
+        self.improve(tours)
+        self.tours = [[self.candidates[i] for i in tour] for tour in tours]
+        self.expectedCosts = [self.tourCost(tour) for tour in tours]
+        self.tour = []
+        self.expectedCost = max(self.expectedCosts)
+
+    def auction(self):
+        """ Leilão sequencial das vítimas (ver __init__)
+        @return lista com o tour de cada agente (listas de índices de candidates)"""
+        tours = [[] for k in range(self.rescuers)]
+        costs = [self.tourCost(tour) for tour in tours]
+        unassigned = set(range(len(self.candidates)))
+        while unassigned:
+            best = None
+            bestKey = None
+            for k, tour in enumerate(tours):
+                bid = self.bestInsertion(tour, costs[k], sorted(unassigned), byRatio=True)
+                if bid is None:
+                    continue
+                victim, position, delta = bid
+                key = (self.gravities[victim] / delta if delta > 0 else float("inf"), -delta)
+                if bestKey is None or key > bestKey:
+                    best = (k, victim, position, delta)
+                    bestKey = key
+            if best is None:
+                break
+            k, victim, position, delta = best
+            tours[k].insert(position, victim)
+            costs[k] += delta
+            unassigned.discard(victim)
+        return tours
+
+    def improve(self, tours):
+        """ Busca local sobre todos os tours (ver __init__) até não haver melhora """
+        improved = True
+        while improved:
+            improved = False
+            for tour in tours:
+                while self.twoOpt(tour) or self.orOpt(tour):
+                    improved = True
+            assigned = {victim for tour in tours for victim in tour}
+            unassigned = [v for v in range(len(self.candidates)) if v not in assigned]
+            for tour in tours:
+                if self.insertVictim(tour, unassigned):
+                    improved = True
+                    break
+                if self.replaceVictim(tour, unassigned) is not None:
+                    improved = True
+                    break
+
+    def planFor(self, index):
+        """ Plano do agente de resgate index: uma cópia deste plano (compartilhando a tabela de caminhos) que segue o tour dele """
+        plan = copy.copy(self)
+        plan.name = self.name + str(index)
+        plan.tour = self.tours[index]
+        plan.expectedCost = self.expectedCosts[index]
+        plan.savedVictims = []
+        plan.savedVictimsIds = []
+        plan.path = []
+        return plan
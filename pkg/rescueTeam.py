@@ -0,0 +1,85 @@
+## TIME DE RESGATE
+### Vários agentes de resgate no mesmo ambiente, todos partindo da base, cada um com o seu tour
+### (as vítimas encontradas são divididas entre eles por RescueAllocation).
+import time as _time
+
+from state import State
+from agentRescue import AgentRescue
+from rescueAllocation import RescueAllocation
+from nullProfiler import NullProfiler
+
+
+class RescueTeam:
+    def __init__(self, model, problem, time, debug_mode, size, pathCache = None, profiler = None, trace = None, distanceFields = False):
+        """
+        Divide as vítimas entre size agentes de resgate (ver RescueAllocation) e cria um AgentRescue para cada um, com
+        o plano que segue o seu tour. Os agentes agem um de cada vez, um ciclo de cada por rodada (ver deliberate), e
+        cada um tem o seu próprio tempo Ts.
+        @param model: referencia o ambiente onde os agentes estão situados
+        @param problem: crenças dos agentes (mapa criado durante a exploração)
+        @param time: tempo para execução de cada agente
+        @param debug_mode: imprime o raciocínio dos agentes
+        @param size: número de agentes de resgate
+        @param pathCache: PathCache usado para não recalcular a tabela de caminhos entre as vítimas
+        @param profiler: Profiler compartilhado pelos agentes, que também mede a divisão das vítimas (None: sem medição)
+        @param trace: TraceLog compartilhado pelos agentes (None: sem registro)
+        @param distanceFields: calcula a tabela de caminhos entre as vítimas com os campos de distância do NumPy (ver distanceField)
+        """
+        self.model = model
+        model.activateAgent(0)
+        base = list(model.agentPos)
+        profiler = profiler if profiler is not None else NullProfiler()
+        start = _time.perf_counter()
+        self.allocation = RescueAllocation(problem, State(base[0], base[1]), time, size, useDistanceFields=distanceFields, pathCache=pathCache)
+        profiler.record("RescueAllocation", _time.perf_counter() - start)
+        profiler.count("RescueAllocation.expansoes", self.allocation.pathFinder.expansions)
+
+        self.rescuers = []
+        for k in range(size):
+            # reaproveita os agentes que já estão no modelo (ex.: exploradores de ExplorerTeam), colocando-os na base
+            index = k if k < len(model.agents) else model.addAgent()
+            model.activateAgent(index)
+            model.setAgentPos(base[0], base[1])
+            self.rescuers.append(AgentRescue(model, problem, time, debug_mode, pathCache, plan=self.allocation.planFor(k), agentIndex=index,
+                                              profiler=profiler, trace=trace))
+        self.active = list(self.rescuers)
+
+    def deliberate(self):
+        """ Uma rodada: cada agente que ainda não terminou executa um ciclo
+        @return -1 quando todos terminaram, 1 caso contrário """
+        for agent in list(self.active):
+            if agent.deliberate() == -1:
+                self.active.remove(agent)
+
+        if not self.active:
+            self.model.activateAgent(0)
+            self.printMetrics()
+            return -1
+        return 1
+
+    def printMetrics(self):
+        metrics = self.getMetrics()
+        print("\nAgentes de resgate: ", len(self.rescuers))
+        print("Número de vítimas salvas: ", metrics["saved"])
+        print("Número de vítimas encontradas: ", metrics["found"])
+        print("Tempo total gasto pelos agentes: ", metrics["cost"])
+        print("pvs: ", metrics["pvs"])
+        print("tvs: ", metrics["tvs"])
+        print("vsg: ", metrics["vsg"])
+
+    def getMetrics(self):
+        """ Métricas do time (as mesmas de AgentRescue.getMetrics), com as vítimas salvas por qualquer um dos agentes e
+        a soma dos custos dos agentes """
+        saved = []
+        savedIds = []
+        for agent in self.rescuers:
+            for victim, victimId in zip(agent.plan.savedVictims, agent.plan.savedVictimsIds):
+                if victim not in saved:
+                    saved.append(victim)
+                    savedIds.append(victimId)
+        self.allocation.savedVictims = saved
+        self.allocation.savedVictimsIds = savedIds
+
+        V = self.model.getNumberOfVictims()
+        victimsVitalSignals = [self.model.getVictimVitalSignals(victimId)[0] for victimId in range(1, V+1)]
+        return self.allocation.getMetrics(sum(agent.costAll for agent in self.rescuers), victimsVitalSignals, V)
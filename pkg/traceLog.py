@@ -0,0 +1,57 @@
+import json
+
+
+class TraceLog:
+    """Registro estruturado do raciocínio dos agentes, no lugar dos print() do modo debug: um registro JSON por linha
+    (JSONL) para cada ciclo de cada agente e para os eventos do ciclo (erro na execução de uma ação, vítima encontrada).
+    As linhas passam por um arquivo com buffer grande, então a escrita não depende do terminal a cada ciclo.
+    O script readTrace.py reconstrói a partir do arquivo o mesmo texto que os agentes imprimiriam no modo debug.
+    Quando o registro não é usado, os agentes recebem um NullTraceLog."""
+
+    # níveis de detalhe: "eventos" só registra os eventos; "ciclos" registra também um resumo de cada ciclo
+    levels = {"eventos": 1, "ciclos": 2}
+
+    def __init__(self, path, level="ciclos", sample=1, bufferSize=1 << 16):
+        """
+        @param path: arquivo onde os registros são salvos
+        @param level: nível de detalhe ("eventos" ou "ciclos")
+        @param sample: registra só um a cada sample ciclos de cada agente (os eventos são sempre registrados)
+        @param bufferSize: tamanho do buffer de escrita do arquivo, em bytes
+        """
+        self.file = open(path, "w", buffering=bufferSize)
+        self.level = self.levels[level]
+        self.sample = sample
+        self.encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def cycle(self, agent, index, n, state, cost, time, action, expected):
+        """ Registra o resumo do ciclo n do agente
+        @param agent: tipo do agente ("explorador", "resgate", "aleatorio")
+        @param index: índice do agente no modelo
+        @param state: posição do agente no início do ciclo
+        @param cost: custo acumulado do agente
+        @param time: tempo disponível do agente
+        @param action: ação escolhida no ciclo
+        @param expected: estado esperado depois da ação """
+        if self.level < 2 or n % self.sample:
+            return
+        self.write({"t": "ciclo", "ag": agent, "i": index, "n": n,
+                    "pos": [state.row, state.col], "custo": cost, "tempo": time,
+                    "acao": action, "esperado": [expected.row, expected.col]})
+
+    def actionError(self, agent, index, n, action, expected, state):
+        """ Registra que a ação do ciclo anterior não levou o agente ao estado esperado """
+        self.write({"t": "erro", "ag": agent, "i": index, "n": n, "acao": action,
+                    "esperado": [expected.row, expected.col], "atual": [state.row, state.col]})
+
+    def victimFound(self, agent, index, n, state, victimId, vitalSignals):
+        """ Registra uma vítima encontrada na posição do agente """
+        self.write({"t": "vitima", "ag": agent, "i": index, "n": n,
+                    "pos": [state.row, state.col], "id": victimId, "sinais": vitalSignals})
+
+    def write(self, record):
+        self.file.write(self.encoder.encode(record))
+        self.file.write("\n")
+
+    def close(self):
+        """ Esvazia o buffer e fecha o arquivo """
+        self.file.close()
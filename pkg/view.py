@@ -101,15 +101,17 @@ class View:
     def draw(self):
         ## Limpa as mensagens do robo
         #self.tela.blit(self.log, (self.largura, 5))
-        ## Apaga a posicao antiga do robo
+        ## Apaga a posicao antiga dos robos
         if self.posRob != None:
-            self.board.listPlaces[self.posRob[0]][self.posRob[1]].setAgent(False)
-            self.board.listPlaces[self.posRob[0]][self.posRob[1]].show()
+            for pos in self.posRob:
+                self.board.listPlaces[pos[0]][pos[1]].setAgent(False)
+                self.board.listPlaces[pos[0]][pos[1]].show()
             
-        ## Desenha o robo na nova posicao, e mostra a mensagem do robo no lado
-        self.board.listPlaces[self.model.agentPos[0]][self.model.agentPos[1]].setAgent(True)
-        self.board.listPlaces[self.model.agentPos[0]][self.model.agentPos[1]].show()
-        self.posRob = (self.model.agentPos[0], self.model.agentPos[1])
+        ## Desenha os robos (ver Model.agents) na nova posicao, e mostra a mensagem do robo no lado
+        for pos in self.model.agents:
+            self.board.listPlaces[pos[0]][pos[1]].setAgent(True)
+            self.board.listPlaces[pos[0]][pos[1]].show()
+        self.posRob = [(pos[0], pos[1]) for pos in self.model.agents]
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
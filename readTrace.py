@@ -0,0 +1,87 @@
+import sys
+import json
+import argparse
+
+
+def readRecords(path):
+    """Lê os registros salvos por TraceLog (um objeto JSON por linha)"""
+    with open(path) as arq:
+        for line in arq:
+            if line.strip():
+                yield json.loads(line)
+
+
+def position(pos):
+    """ Posição no mesmo formato de State.__str__ """
+    return "({0:d}, {1:d})".format(pos[0], pos[1])
+
+
+def eventLines(record):
+    """ Linhas impressas no modo debug para um evento ("erro" ou "vitima") """
+    if record["t"] == "erro":
+        return [("---> erro na execucao da acao ", record["acao"], ": esperava estar em ", position(record["esperado"]),
+                 ", mas estou em ", position(record["atual"]))]
+    return [("vitima encontrada em ", position(record["pos"]), " id: ", record["id"], " sinais vitais: ", record["sinais"])]
+
+
+def cycleLines(record, events):
+    """ Linhas impressas no modo debug em um ciclo, com os eventos do ciclo nos mesmos pontos do raciocínio """
+    errors = [e for e in events if e["t"] == "erro"]
+    victims = [e for e in events if e["t"] == "vitima"]
+    lines = [("\n*** Inicio do ciclo raciocinio ***",),
+             ("Pos agente no amb.: ", position(record["pos"])),
+             ("Ag cre que esta em: ", position(record["pos"]))]
+    for event in errors:
+        lines.extend(eventLines(event))
+    lines.append(("Custo até o momento (com a ação escolhida):", record["custo"]))
+    lines.append(("Tempo disponivel: ", record["tempo"]))
+    for event in victims:
+        lines.extend(eventLines(event))
+    lines.append(("Ag deliberou pela acao: ", record["acao"], " o estado resultado esperado é: ", position(record["esperado"])))
+    return lines
+
+
+def traceLines(records, agent=None):
+    """Reconstrói o texto do modo debug a partir dos registros. Os eventos de um ciclo são registrados antes do resumo
+    do ciclo; eles ficam guardados até o resumo chegar, ou são impressos sozinhos se o ciclo não foi registrado
+    (--trace-level eventos ou --trace-sample). A linha "Ag cre que esta em" aparece uma vez por ciclo (o explorador
+    a imprime também antes do início do ciclo, ao verificar se deve voltar para a base).
+    @param agent: imprime só os registros deste tipo de agente ("explorador", "resgate", "aleatorio")
+    @return gerador com as linhas, cada uma como a tupla de argumentos que os agentes passavam para print"""
+    pending = dict() # (agente, índice) -> (ciclo, eventos do ciclo ainda sem o resumo)
+    for record in records:
+        if agent is not None and record["ag"] != agent:
+            continue
+        key = (record["ag"], record["i"])
+        cycle, events = pending.get(key, (None, []))
+        if cycle != record["n"]:
+            for event in events:
+                yield from eventLines(event)
+            events = []
+        if record["t"] == "ciclo":
+            yield from cycleLines(record, events)
+            pending.pop(key, None)
+        else:
+            events.append(record)
+            pending[key] = (record["n"], events)
+
+    for cycle, events in pending.values():
+        for event in events:
+            yield from eventLines(event)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Imprime o raciocinio dos agentes salvo com main.py --trace")
+    parser.add_argument("trace", help="Arquivo JSONL gerado com --trace")
+    parser.add_argument("--agent", help="Imprime so os registros deste tipo de agente", choices=["explorador", "resgate", "aleatorio"], default=None)
+    args = parser.parse_args()
+
+    try:
+        for line in traceLines(readRecords(args.trace), args.agent):
+            print(*line)
+    except BrokenPipeError: # ex.: python readTrace.py trace.jsonl | head
+        sys.stderr.close()
+
+
+if __name__ == '__main__':
+    main()